@@ -0,0 +1,56 @@
+"""In-memory registry of background optimization jobs."""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Jobs whose status can still be polled; oldest forgotten first
+JOB_STORE_SIZE = 64
+
+_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def create_job() -> str:
+    """
+    Register a new job in the 'pending' state.
+    
+    Returns:
+        Job id to hand back to the client
+    """
+    job_id = uuid.uuid4().hex
+    with _lock:
+        _jobs[job_id] = {'status': 'pending'}
+        if len(_jobs) > JOB_STORE_SIZE:
+            _jobs.popitem(last=False)
+    return job_id
+
+
+def update_job(job_id: str, **fields: Any) -> None:
+    """
+    Update a job's state (status, error, result_id).
+    
+    Args:
+        job_id: Id returned by create_job
+        **fields: Values to set; ignored if the job was already forgotten
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a job's state.
+    
+    Args:
+        job_id: Id returned by create_job
+    
+    Returns:
+        Copy of the job state, or None if unknown or forgotten
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job is not None else None
@@ -0,0 +1,50 @@
+"""In-memory store of recent optimization results for follow-up requests."""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Results kept for follow-up requests (e.g. DXF export); oldest evicted first
+RESULT_STORE_SIZE = 16
+
+_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def store_result(payload: Dict[str, Any]) -> str:
+    """
+    Keep an optimization payload for later requests.
+    
+    Args:
+        payload: Result of build_optimization_payload
+    
+    Returns:
+        Result id to hand back to the client
+    """
+    result_id = uuid.uuid4().hex
+    with _lock:
+        _results[result_id] = {'payload': payload}
+        if len(_results) > RESULT_STORE_SIZE:
+            _results.popitem(last=False)
+    return result_id
+
+
+def get_result(result_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a stored result.
+    
+    The entry holds the payload under 'payload'; callers may cache derived
+    artifacts (such as exported DXF bytes) on it.
+    
+    Args:
+        result_id: Id returned by store_result
+    
+    Returns:
+        Mutable store entry, or None if unknown or evicted
+    """
+    with _lock:
+        entry = _results.get(result_id)
+        if entry is not None:
+            _results.move_to_end(result_id)
+        return entry
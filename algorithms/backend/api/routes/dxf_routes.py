@@ -1,10 +1,16 @@
 """DXF file handling routes."""
 
+import asyncio
 import logging
+from typing import Any, Dict, List
+
+import orjson
+import shapely
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import Response
 
-from utils.dxf_utils import load_boundary_from_dxf, export_to_dxf, validate_dxf
+from api.result_store import get_result
+from utils.dxf_utils import load_boundary_from_dxf, export_to_dxf, read_dxf_document, validate_dxf
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,13 +24,18 @@ async def upload_dxf(file: UploadFile = File(...)):
     Returns GeoJSON polygon that can be used as input.
     """
     try:
-        content = await file.read()
+        # Parse the spooled upload once, off the event loop; validation and
+        # boundary extraction share the document
+        try:
+            doc = await asyncio.to_thread(read_dxf_document, file.file)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to parse DXF: {str(e)}")
         
-        is_valid, message = validate_dxf(content)
+        is_valid, message = validate_dxf(doc)
         if not is_valid:
             raise HTTPException(status_code=400, detail=message)
         
-        polygon = load_boundary_from_dxf(content)
+        polygon = load_boundary_from_dxf(doc)
         
         if polygon is None:
             raise HTTPException(
@@ -34,7 +45,7 @@ async def upload_dxf(file: UploadFile = File(...)):
         
         geojson = {
             "type": "Polygon",
-            "coordinates": [list(polygon.exterior.coords)],
+            "coordinates": [shapely.get_coordinates(polygon.exterior).tolist()],
             "properties": {
                 "source": "dxf",
                 "filename": file.filename,
@@ -57,33 +68,64 @@ async def upload_dxf(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Failed to process DXF: {str(e)}")
 
 
+def export_features(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Collect the features of an OptimizationResponse to write to DXF."""
+    if 'final_layout' in result and result['final_layout']:
+        features = result['final_layout'].get('features', [])
+        
+        # Final layout omits the base stage features drawn beneath it
+        base_index = result.get('base_stage_index')
+        if base_index is not None:
+            base_stage = result.get('stages', [])[base_index]
+            return features + base_stage.get('geometry', {}).get('features', [])
+        return features
+    
+    if 'stages' in result and len(result['stages']) > 0:
+        last_stage = result['stages'][-1]
+        return last_stage.get('geometry', {}).get('features', [])
+    
+    return []
+
+
 @router.post("/export-dxf")
 async def export_dxf_endpoint(request: dict):
     """
     Export optimization results to DXF format.
     
-    Expects: {"result": OptimizationResponse}
+    Expects: {"result_id": str} from a recent optimization, or
+             {"result": OptimizationResponse}
     Returns: DXF file
     """
     try:
-        result = request.get('result')
-        if not result:
-            raise HTTPException(status_code=400, detail="No result data provided")
-        
-        geometries = []
-        
-        if 'final_layout' in result and result['final_layout']:
-            features = result['final_layout'].get('features', [])
-            geometries = features
-        elif 'stages' in result and len(result['stages']) > 0:
-            last_stage = result['stages'][-1]
-            features = last_stage.get('geometry', {}).get('features', [])
-            geometries = features
-        
-        if not geometries:
-            raise HTTPException(status_code=400, detail="No geometries to export")
-        
-        dxf_bytes = export_to_dxf(geometries)
+        result_id = request.get('result_id')
+        if result_id:
+            entry = get_result(result_id)
+            if entry is None:
+                raise HTTPException(status_code=404, detail="Result not found or expired; send the full result")
+            
+            # Exported once per stored result; geometries are orjson Fragments,
+            # which one dumps/loads round trip turns into plain GeoJSON
+            dxf_bytes = entry.get('dxf')
+            if dxf_bytes is None:
+                geometries = orjson.loads(
+                    orjson.dumps(export_features(entry['payload']), option=orjson.OPT_SERIALIZE_NUMPY)
+                )
+                if not geometries:
+                    raise HTTPException(status_code=400, detail="No geometries to export")
+                
+                dxf_bytes = export_to_dxf(geometries)
+                if dxf_bytes:
+                    entry['dxf'] = dxf_bytes
+        else:
+            result = request.get('result')
+            if not result:
+                raise HTTPException(status_code=400, detail="No result data provided")
+            
+            geometries = export_features(result)
+            if not geometries:
+                raise HTTPException(status_code=400, detail="No geometries to export")
+            
+            dxf_bytes = export_to_dxf(geometries)
         
         if not dxf_bytes:
             raise HTTPException(status_code=500, detail="Failed to generate DXF")
@@ -1,291 +1,488 @@
 """Optimization API routes."""
 
+import asyncio
 import logging
-import traceback
-from fastapi import APIRouter, HTTPException
-from shapely.geometry import Polygon, mapping, LineString, Point
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Tuple
 
-from api.schemas.request_schemas import OptimizationRequest
-from api.schemas.response_schemas import OptimizationResponse, StageResult
+import numpy as np
+import orjson
+import shapely
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from shapely.geometry import Polygon
+
+from api.schemas.request_schemas import OptimizationRequest, LandPlot
+from api.schemas.response_schemas import OptimizationResponse
+from api.job_store import create_job, get_job, update_job
+from api.result_store import get_result, store_result
+from core.geometry.polygon_utils import geometries_to_geojson_fragments
 from pipeline.land_redistribution import LandRedistributionPipeline
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# GeoJSON text sequence record prefix (RFC 8142)
+RECORD_SEPARATOR = b"\x1e"
 
-def land_plot_to_polygon(land_plot: dict) -> Polygon:
-    """Convert LandPlot model to Shapely Polygon."""
-    coords = land_plot['coordinates'][0]  # Exterior ring
-    return Polygon(coords)
+# Pipelines run on worker threads but seed the global random module, so
+# runs are serialized to stay reproducible (scale out with --workers)
+_pipeline_lock = threading.Lock()
 
 
-def polygon_to_geojson(poly: Polygon) -> dict:
-    """Convert Shapely Polygon to GeoJSON."""
-    return mapping(poly)
+@lru_cache(maxsize=64)
+def _rings_to_polygons(rings: Tuple[Tuple[Tuple[float, ...], ...], ...]) -> Tuple[Polygon, ...]:
+    """Build polygons from exterior rings in one vectorized call (memoized)."""
+    coords = np.concatenate([np.asarray(ring, dtype=np.float64) for ring in rings])
+    ring_idx = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+    return tuple(shapely.polygons(shapely.linearrings(coords, indices=ring_idx)))
 
 
-@router.post("/optimize", response_model=OptimizationResponse)
-async def optimize_full(request: OptimizationRequest):
+def land_plots_to_polygons(land_plots: List[LandPlot]) -> List[Polygon]:
     """
-    Run complete land redistribution optimization pipeline.
+    Convert LandPlot models to Shapely Polygons.
     
-    This endpoint executes all stages:
-    1. Grid optimization (NSGA-II)
-    2. Block subdivision (OR-Tools)
-    3. Infrastructure planning
+    The UI re-submits the same plots for every stage call, so polygons are
+    cached by their exterior ring coordinates.
     """
-    try:
-        # Convert input land plots to Shapely polygons
-        land_polygons = [land_plot_to_polygon(plot.dict()) for plot in request.land_plots]
-        
-        # Create pipeline
-        config = request.config.dict()
-        logger.info(f"API Request Config: Spacing=[{config.get('spacing_min')}, {config.get('spacing_max')}], RoadWidth={config.get('road_width')}")
+    rings = tuple(
+        tuple(map(tuple, plot.coordinates[0]))  # Exterior rings
+        for plot in land_plots
+    )
+    if not rings:
+        return []
+    
+    return list(_rings_to_polygons(rings))
+
+
+def stage_result(
+    stage_name: str,
+    geometry: Dict[str, Any],
+    metrics: Dict[str, Any],
+    parameters: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build a StageResult as a plain dict for direct orjson serialization."""
+    return {
+        "stage_name": stage_name,
+        "geometry": geometry,
+        "metrics": {key: float(value) for key, value in metrics.items()},
+        "parameters": parameters
+    }
+
+
+def build_optimization_payload(request: OptimizationRequest) -> Dict[str, Any]:
+    """
+    Run the full pipeline and build the OptimizationResponse payload.
+    
+    The payload is a plain dict serialized directly by orjson, skipping
+    pydantic re-validation; geometries are pre-encoded orjson Fragments.
+    """
+    # Convert input land plots to Shapely polygons
+    land_polygons = land_plots_to_polygons(request.land_plots)
+    
+    # Create pipeline
+    config = request.config.model_dump()
+    logger.info(f"API Request Config: Spacing=[{config.get('spacing_min')}, {config.get('spacing_max')}], RoadWidth={config.get('road_width')}")
+    
+    # Run optimization with Grid layout method (orthogonal alignment for better aesthetics)
+    with _pipeline_lock:
         pipeline = LandRedistributionPipeline(land_polygons, config)
-        
-        # Run optimization with Grid layout method (orthogonal alignment for better aesthetics)
         result = pipeline.run_full_pipeline(layout_method='grid')
-        
-        # Build stage results
-        stages = []
-        
-        # Stage 1: Grid Optimization
-        stage1_geoms = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": polygon_to_geojson(block),
-                    "properties": {"stage": "grid", "type": "block"}
-                }
-                for block in result['stage1']['blocks']
-            ]
-        }
-        
-        stages.append(StageResult(
-            stage_name="Grid Optimization (NSGA-II)",
-            geometry=stage1_geoms,
-            metrics=result['stage1']['metrics'],
-            parameters={
-                "spacing": result['stage1']['spacing'],
-                "angle": result['stage1']['angle']
-            }
-        ))
-        
-        # Stage 2: Subdivision
-        stage2_features = []
-        
-        # Add lots
-        for lot in result['stage2']['lots']:
-            lot_props = {
-                "stage": "subdivision",
-                "type": "lot",
-                "width": lot['width']
-            }
-            stage2_features.append({
-                "type": "Feature",
-                "geometry": polygon_to_geojson(lot['geometry']),
-                "properties": lot_props
-            })
-            
-            # Setback
-            if lot.get('buildable'):
-                stage2_features.append({
-                    "type": "Feature",
-                    "geometry": polygon_to_geojson(lot['buildable']),
-                    "properties": {
-                        "stage": "subdivision",
-                        "type": "setback",
-                        "parent_lot": str(lot['geometry'])
-                    }
-                })
-        
-        # Add parks
-        for park in result['stage2']['parks']:
-            stage2_features.append({
+    
+    # Build stage results
+    stages = []
+    
+    # Stage 1: Grid Optimization
+    stage1_geoms = {
+        "type": "FeatureCollection",
+        "features": [
+            {
                 "type": "Feature",
-                "geometry": polygon_to_geojson(park),
-                "properties": {
-                    "stage": "subdivision",
-                    "type": "park"
-                }
-            })
+                "geometry": geom,
+                "properties": {"stage": "grid", "type": "block"}
+            }
+            for geom in geometries_to_geojson_fragments(result['stage1']['blocks'])
+        ]
+    }
+    
+    stages.append(stage_result(
+        stage_name="Grid Optimization (NSGA-II)",
+        geometry=stage1_geoms,
+        metrics=result['stage1']['metrics'],
+        parameters={
+            "spacing": result['stage1']['spacing'],
+            "angle": result['stage1']['angle']
+        }
+    ))
+    
+    # Stage 2: Subdivision
+    stage2_features = []
+    
+    # Serialize lot and setback geometries in two batched calls
+    lots = result['stage2']['lots']
+    lot_geoms = geometries_to_geojson_fragments([lot['geometry'] for lot in lots])
+    setback_lots = [lot for lot in lots if lot.get('buildable')]
+    setback_geoms = iter(geometries_to_geojson_fragments([lot['buildable'] for lot in setback_lots]))
+    
+    # Add lots
+    for lot_id, (lot, lot_geom) in enumerate(zip(lots, lot_geoms)):
+        lot_props = {
+            "stage": "subdivision",
+            "type": "lot",
+            "lot_id": lot_id,
+            "width": lot['width']
+        }
+        stage2_features.append({
+            "type": "Feature",
+            "geometry": lot_geom,
+            "properties": lot_props
+        })
         
-        # Add Service Blocks
-        for block in result['classification'].get('service', []):
+        # Setback
+        if lot.get('buildable'):
             stage2_features.append({
                 "type": "Feature",
-                "geometry": polygon_to_geojson(block),
+                "geometry": next(setback_geoms),
                 "properties": {
                     "stage": "subdivision",
-                    "type": "service",
-                    "label": "Operating Center/Parking"
+                    "type": "setback",
+                    "parent_lot": lot_id
                 }
             })
+    
+    # Add parks
+    for park_geom in geometries_to_geojson_fragments(result['stage2']['parks']):
+        stage2_features.append({
+            "type": "Feature",
+            "geometry": park_geom,
+            "properties": {
+                "stage": "subdivision",
+                "type": "park"
+            }
+        })
+    
+    # Add Service Blocks
+    for block_geom in geometries_to_geojson_fragments(result['classification'].get('service', [])):
+        stage2_features.append({
+            "type": "Feature",
+            "geometry": block_geom,
+            "properties": {
+                "stage": "subdivision",
+                "type": "service",
+                "label": "Operating Center/Parking"
+            }
+        })
 
-        # Add XLNT Block
-        for block in result['classification'].get('xlnt', []):
-            stage2_features.append({
-                "type": "Feature",
-                "geometry": polygon_to_geojson(block),
-                "properties": {
-                    "stage": "subdivision",
-                    "type": "xlnt",
-                    "label": "Wastewater Treatment"
-                }
-            })
+    # Add XLNT Block
+    for block_geom in geometries_to_geojson_fragments(result['classification'].get('xlnt', [])):
+        stage2_features.append({
+            "type": "Feature",
+            "geometry": block_geom,
+            "properties": {
+                "stage": "subdivision",
+                "type": "xlnt",
+                "label": "Wastewater Treatment"
+            }
+        })
 
-        stage2_geoms = {
-            "type": "FeatureCollection",
-            "features": stage2_features
+    stage2_geoms = {
+        "type": "FeatureCollection",
+        "features": stage2_features
+    }
+    
+    base_stage_index = len(stages)
+    stages.append(stage_result(
+        stage_name="Block Subdivision (OR-Tools)",
+        geometry=stage2_geoms,
+        metrics={
+            **result['stage2']['metrics'],
+            "service_count": result['classification']['service_count'],
+            "xlnt_count": result['classification']['xlnt_count']
+        },
+        parameters={
+            "min_lot_width": config['min_lot_width'],
+            "max_lot_width": config['max_lot_width'],
+            "target_lot_width": config['target_lot_width']
         }
-        
-        stages.append(StageResult(
-            stage_name="Block Subdivision (OR-Tools)",
-            geometry=stage2_geoms,
-            metrics={
-                **result['stage2']['metrics'],
-                "service_count": result['classification']['service_count'],
-                "xlnt_count": result['classification']['xlnt_count']
-            },
-            parameters={
-                "min_lot_width": config['min_lot_width'],
-                "max_lot_width": config['max_lot_width'],
-                "target_lot_width": config['target_lot_width']
+    ))
+    
+    # Stage 3: Infrastructure
+    stage3_features = []
+    
+    # Add road network
+    if 'road_network' in result['stage3']:
+        road_feat = {
+            "type": "Feature",
+            "geometry": result['stage3']['road_network'],
+            "properties": {
+                "stage": "infrastructure",
+                "type": "road_network",
+                "label": "Transportation Infra"
             }
-        ))
-        
-        # Stage 3: Infrastructure
-        stage3_features = []
+        }
+        stage3_features.insert(0, road_feat)
+
+    # Add connection lines (GeoJSON built directly, no shapely round trip;
+    # coordinates are numpy arrays written by OPT_SERIALIZE_NUMPY)
+    for conn_coords in result['stage3']['connections']:
+        stage3_features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": conn_coords},
+            "properties": {
+                "stage": "infrastructure",
+                "type": "connection",
+                "layer": "electricity_water"
+            }
+        })
         
-        # Add road network
-        if 'road_network' in result['stage3']:
-            road_feat = {
-                "type": "Feature",
-                "geometry": result['stage3']['road_network'],
-                "properties": {
-                    "stage": "infrastructure",
-                    "type": "road_network",
-                    "label": "Transportation Infra"
-                }
+    # Add Transformers
+    transformer_coords = np.asarray(result['stage3'].get('transformers', []), dtype=np.float64)
+    for tf_coords in transformer_coords:
+        stage3_features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": tf_coords},
+            "properties": {
+                "stage": "infrastructure",
+                "type": "transformer",
+                "label": "Transformer Station"
             }
-            stage3_features.insert(0, road_feat)
+        })
 
-        # Add connection lines
-        for conn_coords in result['stage3']['connections']:
-            stage3_features.append({
-                "type": "Feature",
-                "geometry": mapping(LineString(conn_coords)),
-                "properties": {
-                    "stage": "infrastructure",
-                    "type": "connection",
-                    "layer": "electricity_water"
-                }
-            })
-            
-        # Add Transformers
-        if 'transformers' in result['stage3']:
-            for tf_coords in result['stage3']['transformers']:
-                stage3_features.append({
-                    "type": "Feature",
-                    "geometry": mapping(Point(tf_coords)),
-                    "properties": {
-                        "stage": "infrastructure",
-                        "type": "transformer",
-                        "label": "Transformer Station"
-                    }
-                })
-
-        # Add drainage
-        for drainage in result['stage3']['drainage']:
-            start = drainage['start']
-            vec = drainage['vector']
-            end = (start[0] + vec[0], start[1] + vec[1])
-            stage3_features.append({
-                "type": "Feature",
-                "geometry": mapping(LineString([start, end])),
-                "properties": {
-                    "stage": "infrastructure",
-                    "type": "drainage"
-                }
-            })
-            
-        stage3_geoms = {
-            "type": "FeatureCollection",
-            "features": stage3_features + stage2_features
-        }
-        
-        stages.append(StageResult(
-            stage_name="Infrastructure (MST & Drainage & Roads)",
-            geometry=stage3_geoms,
-            metrics={
-                "total_connections": len(result['stage3']['connections']),
-                "drainage_points": len(result['stage3']['drainage']),
-                "transformers": len(result.get('stage3', {}).get('transformers', []))
-            },
-            parameters={}
-        ))
+    # Add drainage: (start, start + vector) segments stacked into one array
+    drainage = result['stage3']['drainage']
+    starts = np.array([d['start'] for d in drainage], dtype=np.float64).reshape(-1, 2)
+    vectors = np.array([d['vector'] for d in drainage], dtype=np.float64).reshape(-1, 2)
+    segments = np.stack([starts, starts + vectors], axis=1)
+    for segment in segments:
+        stage3_features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": segment},
+            "properties": {
+                "stage": "infrastructure",
+                "type": "drainage"
+            }
+        })
         
-        return OptimizationResponse(
-            success=True,
-            message="Optimization completed successfully",
-            stages=stages,
-            final_layout=stage3_geoms,
-            total_lots=result['total_lots'],
-            statistics={
-                "total_blocks": result['stage1']['metrics']['total_blocks'],
-                "total_lots": result['stage2']['metrics']['total_lots'],
-                "total_parks": result['stage2']['metrics']['total_parks'],
-                "optimal_spacing": result['stage1']['spacing'],
-                "optimal_angle": result['stage1']['angle'],
-                "avg_lot_width": result['stage2']['metrics']['avg_lot_width'],
-                "service_area_count": result['classification']['service_count'] + result['classification']['xlnt_count']
+    # Stage 2 features are not repeated here: clients draw the stage at
+    # base_stage_index underneath final_layout
+    stage3_geoms = {
+        "type": "FeatureCollection",
+        "features": stage3_features
+    }
+    
+    stages.append(stage_result(
+        stage_name="Infrastructure (MST & Drainage & Roads)",
+        geometry=stage3_geoms,
+        metrics={
+            "total_connections": len(result['stage3']['connections']),
+            "drainage_points": len(result['stage3']['drainage']),
+            "transformers": len(result.get('stage3', {}).get('transformers', []))
+        },
+        parameters={}
+    ))
+    
+    payload = {
+        "success": True,
+        "message": "Optimization completed successfully",
+        "stages": stages,
+        "final_layout": stage3_geoms,
+        "base_stage_index": base_stage_index,
+        "total_lots": result['total_lots'],
+        "statistics": {
+            "total_blocks": result['stage1']['metrics']['total_blocks'],
+            "total_lots": result['stage2']['metrics']['total_lots'],
+            "total_parks": result['stage2']['metrics']['total_parks'],
+            "optimal_spacing": result['stage1']['spacing'],
+            "optimal_angle": result['stage1']['angle'],
+            "avg_lot_width": result['stage2']['metrics']['avg_lot_width'],
+            "service_area_count": result['classification']['service_count'] + result['classification']['xlnt_count']
+        }
+    }
+    
+    # Kept server-side so /export-dxf can take the id instead of the payload
+    payload["result_id"] = store_result(payload)
+    return payload
+
+
+def build_stage1_payload(request: OptimizationRequest) -> Dict[str, Any]:
+    """Run grid optimization only and build its OptimizationResponse payload."""
+    land_polygons = land_plots_to_polygons(request.land_plots)
+    config = request.config.model_dump()
+    
+    with _pipeline_lock:
+        pipeline = LandRedistributionPipeline(land_polygons, config)
+        result = pipeline.run_stage1()
+    
+    stage_geoms = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": geom,
+                "properties": {"stage": "grid", "type": "block"}
+            }
+            for geom in geometries_to_geojson_fragments(result['blocks'])
+        ]
+    }
+    
+    return {
+        "success": True,
+        "message": "Stage 1 (Grid Optimization) completed",
+        "stages": [stage_result(
+            stage_name="Grid Optimization (NSGA-II)",
+            geometry=stage_geoms,
+            metrics=result['metrics'],
+            parameters={
+                "spacing": result['spacing'],
+                "angle": result['angle']
             }
-        )
+        )],
+        "final_layout": None,
+        "total_lots": None,
+        "statistics": result['metrics']
+    }
+
+
+def iter_geojson_seq(payload: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Encode an optimization payload as a GeoJSON text sequence (RFC 8142).
+    
+    The first record is the payload without features; every stage geometry
+    is a FeatureCollection stub. Each following record is one Feature whose
+    "stages" member lists the stage indices it belongs to. Features are
+    emitted so that appending them in order rebuilds every stage's list.
+    
+    The payload is already complete when this is called: records are
+    encoded one at a time, but the whole result stays in memory.
+    
+    Args:
+        payload: Result of build_optimization_payload
         
+    Yields:
+        RS-prefixed, newline-terminated JSON records
+    """
+    stages = payload['stages']
+    collections = [stage['geometry']['features'] for stage in stages]
+    
+    # Stage membership per feature (later stages embed earlier features)
+    membership: Dict[int, List[int]] = {}
+    for index, features in enumerate(collections):
+        for feature in features:
+            membership.setdefault(id(feature), []).append(index)
+    
+    final_stage = next(
+        (i for i, stage in enumerate(stages) if stage['geometry'] is payload['final_layout']),
+        None
+    )
+    header = {
+        **{key: value for key, value in payload.items() if key not in ('stages', 'final_layout')},
+        "final_layout_stage": final_stage,
+        "stages": [
+            {**stage, "geometry": {"type": "FeatureCollection", "features": []}}
+            for stage in stages
+        ]
+    }
+    yield RECORD_SEPARATOR + orjson.dumps(header, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+    
+    # Walk from the last stage so each stage's feature order is preserved
+    emitted = set()
+    for features in reversed(collections):
+        for feature in features:
+            if id(feature) in emitted:
+                continue
+            emitted.add(id(feature))
+            yield (
+                RECORD_SEPARATOR
+                + orjson.dumps({**feature, "stages": membership[id(feature)]}, option=orjson.OPT_SERIALIZE_NUMPY)
+                + b"\n"
+            )
+
+
+@router.post("/optimize", response_class=StreamingResponse, responses={200: {"content": {"application/geo+json-seq": {}}}})
+async def optimize_stream(request: OptimizationRequest):
+    """
+    Run complete land redistribution optimization pipeline.
+    
+    This endpoint executes all stages:
+    1. Grid optimization (NSGA-II)
+    2. Block subdivision (OR-Tools)
+    3. Infrastructure planning
+    
+    Results are sent as a GeoJSON text sequence (see iter_geojson_seq);
+    use /optimize/full for a single JSON document. The pipeline runs to
+    completion before the first record, so time to first byte and peak
+    memory match /optimize/full; the sequence only spares encoding one large
+    document and lets the client parse record by record.
+    """
+    try:
+        payload = await asyncio.to_thread(build_optimization_payload, request)
+    except Exception as e:
+        # Full traceback stays in the server log; clients get the message only
+        logger.exception("Optimization failed")
+        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+    
+    return StreamingResponse(iter_geojson_seq(payload), media_type="application/geo+json-seq")
+
+
+def run_optimization_job(job_id: str, request: OptimizationRequest) -> None:
+    """Run the full pipeline for a submitted job, recording its outcome."""
+    update_job(job_id, status='running')
+    try:
+        payload = build_optimization_payload(request)
+    except Exception as e:
+        logger.exception("Optimization failed")
+        update_job(job_id, status='failed', error=f"Optimization failed: {str(e)}")
+        return
+    update_job(job_id, status='complete', result_id=payload['result_id'])
+
+
+@router.post("/jobs", status_code=202)
+async def submit_optimization(request: OptimizationRequest, background_tasks: BackgroundTasks):
+    """
+    Start the complete pipeline in the background.
+    
+    Returns {"job_id": ...} at once; poll /status/{job_id} until it is
+    complete, then fetch /result/{result_id}.
+    """
+    job_id = create_job()
+    background_tasks.add_task(run_optimization_job, job_id, request)
+    return {"job_id": job_id}
+
+
+@router.get("/status/{job_id}")
+async def job_status(job_id: str):
+    """State of a submitted job: pending, running, complete (with result_id) or failed (with error)."""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return {"job_id": job_id, **job}
+
+
+@router.get("/result/{result_id}", response_class=StreamingResponse, responses={200: {"content": {"application/geo+json-seq": {}}}})
+async def stored_result(result_id: str):
+    """Stream a stored result in the /optimize format."""
+    entry = get_result(result_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Result not found or expired")
+    return StreamingResponse(iter_geojson_seq(entry['payload']), media_type="application/geo+json-seq")
+
+
+@router.post("/optimize/full", response_model=None, responses={200: {"model": OptimizationResponse}})
+async def optimize_full(request: OptimizationRequest):
+    """Run the complete pipeline and return the result as one JSON document."""
+    try:
+        return ORJSONResponse(content=await asyncio.to_thread(build_optimization_payload, request))
     except Exception as e:
-        error_msg = f"Optimization failed: {str(e)}\n{traceback.format_exc()}"
-        logger.error(error_msg)
-        raise HTTPException(status_code=500, detail=error_msg)
+        logger.exception("Optimization failed")
+        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
 
-@router.post("/stage1", response_model=OptimizationResponse)
+@router.post("/stage1", response_model=None, responses={200: {"model": OptimizationResponse}})
 async def optimize_stage1(request: OptimizationRequest):
     """Run only grid optimization stage."""
     try:
-        land_polygons = [land_plot_to_polygon(plot.dict()) for plot in request.land_plots]
-        config = request.config.dict()
-        pipeline = LandRedistributionPipeline(land_polygons, config)
-        
-        result = pipeline.run_stage1()
-        
-        stage_geoms = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": polygon_to_geojson(block),
-                    "properties": {"stage": "grid", "type": "block"}
-                }
-                for block in result['blocks']
-            ]
-        }
-        
-        return OptimizationResponse(
-            success=True,
-            message="Stage 1 (Grid Optimization) completed",
-            stages=[StageResult(
-                stage_name="Grid Optimization (NSGA-II)",
-                geometry=stage_geoms,
-                metrics=result['metrics'],
-                parameters={
-                    "spacing": result['spacing'],
-                    "angle": result['angle']
-                }
-            )],
-            statistics=result['metrics']
-        )
-        
+        return ORJSONResponse(content=await asyncio.to_thread(build_stage1_payload, request))
     except Exception as e:
-        logger.error(f"Stage 1 failed: {e}")
+        logger.exception("Stage 1 failed")
         raise HTTPException(status_code=500, detail=f"Stage 1 failed: {str(e)}")
@@ -20,8 +20,10 @@ class OptimizationResponse(BaseModel):
     message: str = Field(..., description="Status message")
     stages: List[StageResult] = Field(default=[], description="Results from each stage")
     final_layout: Optional[Dict[str, Any]] = Field(None, description="Final GeoJSON layout")
+    base_stage_index: Optional[int] = Field(None, description="Stage whose features lie beneath final_layout")
     total_lots: Optional[int] = Field(None, description="Total number of lots created")
     statistics: Optional[Dict[str, Any]] = Field(None, description="Overall statistics")
+    result_id: Optional[str] = Field(None, description="Id accepted by /export-dxf in place of the result")
 
 
 class HealthResponse(BaseModel):
@@ -6,6 +6,7 @@ organized into dataclasses for type safety and clarity.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Tuple
 
 
@@ -18,6 +19,8 @@ class RoadSettings:
     internal_width: float = 10.0   # Internal road (reduced from 15.0 to allow better efficiency)
     sidewalk_width: float = 4.0    # Sidewalk each side (includes utility trench)
     turning_radius: float = 15.0   # Corner chamfer radius for intersections
+    voronoi_cell_size: float = 100.0  # Typical Voronoi block side, sets seed density
+    smoothing_quad_segs: int = 4      # Arc segments per quarter circle in road smoothing
 
 
 @dataclass(frozen=True)
@@ -39,6 +42,11 @@ class SubdivisionSettings:
     
     # Solver
     solver_time_limit: float = 0.5      # OR-Tools time limit per block (seconds)
+    analytic_min_rectangularity: float = 0.95  # Blocks above this skip CP-SAT
+    analytic_max_aspect_ratio: float = 4.0     # ...if also below this aspect ratio
+    max_workers: int = 0                # Processes for per-block CP-SAT (0 = CPU count)
+    solver_area_per_worker: float = 5000.0  # Block area (m²) per CP-SAT search worker
+    solver_max_search_workers: int = 8      # Cap on CP-SAT search workers per block
 
 
 @dataclass(frozen=True)
@@ -78,6 +86,9 @@ class OptimizationSettings:
     # Block quality thresholds
     good_block_ratio: float = 0.65      # Ratio for residential/commercial
     fragmented_block_ratio: float = 0.1 # Below this = too small
+    
+    # Selection
+    use_vectorized_nsga2: bool = True   # NumPy non-dominated sort + crowding distance
 
 
 @dataclass(frozen=True)
@@ -117,7 +128,23 @@ class AlgorithmSettings:
     
     @classmethod
     def from_dict(cls, config: dict) -> 'AlgorithmSettings':
-        """Create settings from API config dictionary."""
+        """
+        Create settings from API config dictionary.
+        
+        Identical configs share one cached settings object; treat the
+        result as read-only.
+        """
+        try:
+            key = tuple(sorted(config.items()))
+            hash(key)
+        except TypeError:
+            return cls._build_from_dict(config)
+        
+        return _cached_settings(cls, key)
+    
+    @classmethod
+    def _build_from_dict(cls, config: dict) -> 'AlgorithmSettings':
+        """Build settings from API config dictionary (uncached)."""
         settings = cls()
         
         # Map API config to internal settings
@@ -152,6 +179,12 @@ class AlgorithmSettings:
         return settings
 
 
+@lru_cache(maxsize=32)
+def _cached_settings(settings_cls: type, config_items: tuple) -> AlgorithmSettings:
+    """Memoized AlgorithmSettings keyed by sorted config items."""
+    return settings_cls._build_from_dict(dict(config_items))
+
+
 # Default settings instance
 DEFAULT_SETTINGS = AlgorithmSettings()
 
@@ -161,6 +194,8 @@ ROAD_MAIN_WIDTH = DEFAULT_SETTINGS.road.main_width
 ROAD_INTERNAL_WIDTH = DEFAULT_SETTINGS.road.internal_width
 SIDEWALK_WIDTH = DEFAULT_SETTINGS.road.sidewalk_width
 TURNING_RADIUS = DEFAULT_SETTINGS.road.turning_radius
+VORONOI_CELL_SIZE = DEFAULT_SETTINGS.road.voronoi_cell_size
+SMOOTHING_QUAD_SEGS = DEFAULT_SETTINGS.road.smoothing_quad_segs
 SERVICE_AREA_RATIO = DEFAULT_SETTINGS.subdivision.service_area_ratio
 MIN_BLOCK_AREA = DEFAULT_SETTINGS.subdivision.min_block_area
 MIN_LOT_WIDTH = DEFAULT_SETTINGS.subdivision.min_lot_width
@@ -169,6 +204,11 @@ TARGET_LOT_WIDTH = DEFAULT_SETTINGS.subdivision.target_lot_width
 SETBACK_DISTANCE = DEFAULT_SETTINGS.subdivision.setback_distance
 FIRE_SAFETY_GAP = DEFAULT_SETTINGS.subdivision.fire_safety_gap
 SOLVER_TIME_LIMIT = DEFAULT_SETTINGS.subdivision.solver_time_limit
+SOLVER_AREA_PER_WORKER = DEFAULT_SETTINGS.subdivision.solver_area_per_worker
+SOLVER_MAX_SEARCH_WORKERS = DEFAULT_SETTINGS.subdivision.solver_max_search_workers
+ANALYTIC_MIN_RECTANGULARITY = DEFAULT_SETTINGS.subdivision.analytic_min_rectangularity
+ANALYTIC_MAX_ASPECT_RATIO = DEFAULT_SETTINGS.subdivision.analytic_max_aspect_ratio
+SUBDIVISION_MAX_WORKERS = DEFAULT_SETTINGS.subdivision.max_workers
 TRANSFORMER_RADIUS = DEFAULT_SETTINGS.infrastructure.transformer_radius
 
 # Aesthetic thresholds (from Beauti_mode)
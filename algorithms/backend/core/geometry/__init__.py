@@ -2,10 +2,12 @@ from core.geometry.polygon_utils import (
     get_elevation,
     normalize_geometry_list,
     merge_polygons,
+    cached_union,
 )
 from core.geometry.voronoi import (
     generate_voronoi_seeds,
     create_voronoi_diagram,
+    create_voronoi_edges,
     extract_voronoi_edges,
 )
 from core.geometry.shape_quality import (
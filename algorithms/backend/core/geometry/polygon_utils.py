@@ -6,13 +6,25 @@ elevation calculations, and geometry normalization.
 """
 
 import logging
-from typing import List, Union, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union, Optional
 
-from shapely.geometry import Polygon, MultiPolygon, GeometryCollection
+import numpy as np
+import orjson
+import shapely
+from shapely.geometry import Polygon, MultiPolygon, GeometryCollection, LineString, mapping
 from shapely.ops import unary_union
 
 logger = logging.getLogger(__name__)
 
+# GEOS releases the GIL in vectorized shapely calls; below this many
+# geometries a thread pool costs more than it saves
+GEOJSON_PARALLEL_MIN_GEOMS = 1000
+_GEOJSON_WORKERS = os.cpu_count() or 1
+_geojson_executor: Optional[ThreadPoolExecutor] = None
+
 
 def get_elevation(x: float, y: float) -> float:
     """
@@ -20,13 +32,14 @@ def get_elevation(x: float, y: float) -> float:
     
     This is a simple linear model: z = 50 - 0.02x - 0.03y
     Used for determining WWTP placement (lowest point).
+    Also accepts numpy arrays of coordinates for batch evaluation.
     
     Args:
-        x: X coordinate
-        y: Y coordinate
+        x: X coordinate(s)
+        y: Y coordinate(s)
         
     Returns:
-        Simulated elevation value
+        Simulated elevation value(s)
     """
     return 50.0 - (x * 0.02) - (y * 0.03)
 
@@ -81,6 +94,29 @@ def merge_polygons(polygons: List[Polygon]) -> Polygon:
     return unary_union(polygons)
 
 
+@lru_cache(maxsize=32)
+def _cached_union(wkb_key: Tuple[bytes, ...]):
+    """Union the geometries encoded in a WKB key (memoized)."""
+    return shapely.unary_union(shapely.from_wkb(np.array(wkb_key, dtype=object)))
+
+
+def cached_union(polygons: List[Polygon]):
+    """
+    Union polygons, reusing the result for a previously seen set.
+    
+    Interactive sessions re-submit the same plots (/stage1 then /optimize),
+    so results are memoized by the sorted WKB of the inputs.
+    
+    Args:
+        polygons: List of Polygon objects
+        
+    Returns:
+        Union of the polygons (shared, treat as read-only)
+    """
+    wkb_key = tuple(sorted(shapely.to_wkb(np.asarray(polygons, dtype=object))))
+    return _cached_union(wkb_key)
+
+
 def filter_by_min_area(
     polygons: List[Polygon], 
     min_area: float
@@ -98,6 +134,32 @@ def filter_by_min_area(
     return [p for p in polygons if p.area >= min_area]
 
 
+def extract_polygons_by_min_area(
+    geometry: Union[Polygon, MultiPolygon, GeometryCollection, None],
+    min_area: float
+) -> List[Polygon]:
+    """
+    Fused normalize_geometry_list + filter_by_min_area.
+    
+    Splits the geometry into parts and filters them by area with
+    vectorized shapely calls instead of two Python passes.
+    
+    Args:
+        geometry: Input geometry of various types
+        min_area: Minimum area threshold (m²)
+        
+    Returns:
+        Polygon parts meeting the area requirement
+    """
+    if geometry is None or geometry.is_empty:
+        return []
+    
+    parts = shapely.get_parts(geometry)
+    # Polygon parts only; empty polygons have zero area and drop out below
+    parts = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+    return parts[shapely.area(parts) >= min_area].tolist()
+
+
 def sort_by_elevation(polygons: List[Polygon]) -> List[Polygon]:
     """
     Sort polygons by centroid elevation (lowest first).
@@ -110,10 +172,12 @@ def sort_by_elevation(polygons: List[Polygon]) -> List[Polygon]:
     Returns:
         Sorted list (lowest elevation first)
     """
-    return sorted(
-        polygons, 
-        key=lambda p: get_elevation(p.centroid.x, p.centroid.y)
-    )
+    if not polygons:
+        return []
+    
+    centroids = shapely.centroid(np.asarray(polygons, dtype=object))
+    elevations = get_elevation(shapely.get_x(centroids), shapely.get_y(centroids))
+    return [polygons[i] for i in np.argsort(elevations, kind='stable')]
 
 
 def calculate_block_quality_ratio(
@@ -135,3 +199,135 @@ def calculate_block_quality_ratio(
     if original_area <= 0:
         return 0.0
     return min(1.0, block.area / original_area)
+
+
+def _split_coordinates(geoms: np.ndarray, as_arrays: bool = False) -> List[Any]:
+    """Fetch all coordinates in one call and split them per geometry."""
+    coords, index = shapely.get_coordinates(geoms, return_index=True)
+    splits = np.searchsorted(index, np.arange(1, len(geoms)))
+    parts = np.split(coords, splits)
+    return parts if as_arrays else [part.tolist() for part in parts]
+
+
+def batch_line_coords(
+    lines: List[LineString],
+    as_arrays: bool = False
+) -> List[Any]:
+    """
+    Extract coordinate lists for many LineStrings at once.
+    
+    Equivalent to ``[list(line.coords) for line in lines]`` but marshals
+    all coordinates out of GEOS in a single vectorized call.
+    
+    Args:
+        lines: List of LineString objects
+        as_arrays: Return (N, 2) float arrays instead of nested lists;
+            orjson writes these directly with OPT_SERIALIZE_NUMPY
+        
+    Returns:
+        List of [[x, y], ...] coordinates, one per line
+    """
+    if not lines:
+        return []
+    
+    return _split_coordinates(np.asarray(lines, dtype=object), as_arrays=as_arrays)
+
+
+def batch_exterior_coords(
+    geometries: List[Union[Polygon, MultiPolygon]]
+) -> List[List[List[float]]]:
+    """
+    Extract exterior ring coordinates for many polygons at once.
+    
+    Polygons yield their exterior ring; MultiPolygons yield the exterior
+    of their largest part; any other geometry yields an empty list.
+    
+    Args:
+        geometries: List of Polygon/MultiPolygon objects
+        
+    Returns:
+        List of [[x, y], ...] coordinate lists, one per input geometry
+    """
+    if not geometries:
+        return []
+    
+    geoms = np.asarray(geometries, dtype=object)
+    result: List[List[List[float]]] = [[] for _ in range(len(geoms))]
+    
+    parts, owner = shapely.get_parts(geoms, return_index=True)
+    owner_type = shapely.get_type_id(geoms)[owner]
+    keep = np.isin(owner_type, (3, 6)) & (shapely.get_type_id(parts) == 3)
+    parts, owner = parts[keep], owner[keep]
+    if len(parts) == 0:
+        return result
+    
+    # Largest part per owner: sort by (owner, -area) and take the first of each run
+    order = np.lexsort((-shapely.area(parts), owner))
+    sorted_owner = owner[order]
+    first = order[np.r_[True, sorted_owner[1:] != sorted_owner[:-1]]]
+    
+    rings = shapely.get_exterior_ring(parts[first])
+    for idx, coords in zip(owner[first], _split_coordinates(rings)):
+        result[idx] = coords
+    
+    return result
+
+
+def geometry_to_geojson_fragment(geometry) -> orjson.Fragment:
+    """
+    Convert a geometry to pre-serialized GeoJSON.
+    
+    The fragment is embedded verbatim by ``orjson.dumps``, so a large road
+    network is never expanded into nested Python lists.
+    
+    Args:
+        geometry: Any Shapely geometry
+        
+    Returns:
+        orjson.Fragment holding the GeoJSON geometry
+    """
+    if geometry.is_empty:
+        return orjson.Fragment(orjson.dumps(mapping(geometry)))
+    return orjson.Fragment(shapely.to_geojson(geometry))
+
+
+def _to_geojson_threaded(geoms: np.ndarray) -> np.ndarray:
+    """Run shapely.to_geojson over chunks of a large array on worker threads."""
+    global _geojson_executor
+    
+    if _GEOJSON_WORKERS < 2 or len(geoms) < GEOJSON_PARALLEL_MIN_GEOMS:
+        return shapely.to_geojson(geoms)
+    
+    if _geojson_executor is None:
+        _geojson_executor = ThreadPoolExecutor(max_workers=_GEOJSON_WORKERS)
+    
+    chunks = np.array_split(geoms, _GEOJSON_WORKERS)
+    return np.concatenate(list(_geojson_executor.map(shapely.to_geojson, chunks)))
+
+
+def geometries_to_geojson_fragments(geometries: List[Any]) -> List[orjson.Fragment]:
+    """
+    Convert many geometries to pre-serialized GeoJSON at once.
+    
+    All geometries are written by vectorized ``shapely.to_geojson`` calls;
+    the GEOS output is wrapped in orjson.Fragment and spliced in verbatim
+    by ``orjson.dumps`` instead of being parsed back into Python dicts.
+    Large inputs are serialized in chunks across threads.
+    
+    Args:
+        geometries: List of Shapely geometries
+        
+    Returns:
+        List of orjson.Fragment GeoJSON geometries, in input order
+    """
+    if not len(geometries):
+        return []
+    
+    geoms = np.asarray(geometries, dtype=object)
+    texts = _to_geojson_threaded(geoms)
+    empty = shapely.is_empty(geoms)
+    
+    return [
+        orjson.Fragment(orjson.dumps(mapping(geom)) if is_empty else text)
+        for geom, text, is_empty in zip(geoms, texts, empty)
+    ]
@@ -183,6 +183,39 @@ def get_obb_dimensions(polygon: Polygon) -> Tuple[float, float, float]:
     return width, length, angle_deg
 
 
+def is_near_rectangular(
+    polygon: Polygon,
+    min_rectangularity: float = 0.95,
+    max_aspect_ratio: float = DEFAULT_MAX_ASPECT_RATIO
+) -> bool:
+    """
+    Check whether a polygon is close enough to a rectangle for strip layout.
+    
+    Args:
+        polygon: Shapely Polygon to test
+        min_rectangularity: Minimum area / OBB area ratio
+        max_aspect_ratio: Maximum OBB length / width ratio
+        
+    Returns:
+        True if the polygon fills its OBB and is not too elongated
+    """
+    if polygon.is_empty or not polygon.is_valid:
+        return False
+    
+    obb_area = polygon.minimum_rotated_rectangle.area
+    if obb_area <= 0:
+        return False
+    
+    width, length, _ = get_obb_dimensions(polygon)
+    if width <= 0:
+        return False
+    
+    return (
+        polygon.area / obb_area >= min_rectangularity
+        and length / width <= max_aspect_ratio
+    )
+
+
 def classify_lot_type(
     polygon: Polygon,
     min_rectangularity: float = DEFAULT_MIN_RECTANGULARITY,
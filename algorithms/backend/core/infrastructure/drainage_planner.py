@@ -6,9 +6,10 @@ Wastewater Treatment Plant (WWTP/XLNT) located at the lowest elevation.
 """
 
 import logging
-import math
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, Point
 
 from core.config.settings import InfrastructureSettings, DEFAULT_SETTINGS
@@ -19,7 +20,8 @@ logger = logging.getLogger(__name__)
 def calculate_drainage(
     lots: List[Polygon],
     wwtp_centroid: Optional[Point],
-    arrow_length: Optional[float] = None
+    arrow_length: Optional[float] = None,
+    ctx: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
     Calculate drainage flow direction towards WWTP (gravity flow).
@@ -31,6 +33,7 @@ def calculate_drainage(
         lots: List of lot polygons
         wwtp_centroid: Location of WWTP (lowest elevation)
         arrow_length: Visualization arrow length (m)
+        ctx: Precomputed lot artifacts shared across planners (optional)
         
     Returns:
         List of dicts with 'start' and 'vector' keys
@@ -47,33 +50,27 @@ def calculate_drainage(
     if not lots:
         return arrows
     
-    for lot in lots:
-        try:
-            c = lot.centroid
-            
-            # Vector from lot to WWTP
-            dx = wwtp_centroid.x - c.x
-            dy = wwtp_centroid.y - c.y
-            
-            # Calculate length (with safe division)
-            length = math.sqrt(dx * dx + dy * dy)
-            
-            if length > 0:
-                # Normalize vector and scale to arrow length
-                norm_dx = dx / length * arrow_len
-                norm_dy = dy / length * arrow_len
-                
-                arrows.append({
-                    'start': (c.x, c.y),
-                    'vector': (norm_dx, norm_dy)
-                })
-            else:
-                # Lot is at WWTP location (unlikely but handle it)
-                logger.debug("Lot centroid coincides with WWTP")
-                
-        except Exception as e:
-            logger.warning(f"Error calculating drainage for lot: {e}")
-            continue
+    centroids = ctx.get('centroids') if ctx is not None else None
+    if centroids is None:
+        centroids = shapely.centroid(np.asarray(lots, dtype=object))
+    starts = shapely.get_coordinates(np.asarray(centroids, dtype=object))
+    
+    # Vectors from lots to WWTP
+    deltas = np.array([wwtp_centroid.x, wwtp_centroid.y]) - starts
+    lengths = np.sqrt(deltas[:, 0] * deltas[:, 0] + deltas[:, 1] * deltas[:, 1])
+    
+    # Lots at the WWTP location have no direction (unlikely but handle it)
+    valid = lengths > 0
+    if not valid.all():
+        logger.debug("Lot centroid coincides with WWTP")
+    
+    # Normalize vectors and scale to arrow length
+    vectors = deltas[valid] / lengths[valid, None] * arrow_len
+    
+    arrows = [
+        {'start': tuple(start), 'vector': tuple(vector)}
+        for start, vector in zip(starts[valid].tolist(), vectors.tolist())
+    ]
     
     logger.debug(f"Calculated drainage for {len(arrows)} lots")
     return arrows
@@ -6,10 +6,11 @@ redundant edges for reliability (loop network).
 """
 
 import logging
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Any, Optional
 
 import numpy as np
 import networkx as nx
+import shapely
 from shapely.geometry import Polygon, LineString
 
 from core.config.settings import InfrastructureSettings, DEFAULT_SETTINGS
@@ -20,7 +21,8 @@ logger = logging.getLogger(__name__)
 def generate_loop_network(
     lots: List[Polygon],
     max_distance: float = None,
-    redundancy_ratio: float = None
+    redundancy_ratio: float = None,
+    ctx: Optional[Dict[str, Any]] = None
 ) -> Tuple[List[List[float]], List[LineString]]:
     """
     Generate Loop Network for electrical/utility infrastructure.
@@ -32,6 +34,7 @@ def generate_loop_network(
         lots: List of lot polygons
         max_distance: Maximum connection distance (m)
         redundancy_ratio: Extra edges to add (0.0-1.0)
+        ctx: Precomputed lot artifacts shared across planners (optional)
         
     Returns:
         (points, connection_lines) where:
@@ -47,20 +50,28 @@ def generate_loop_network(
         return [], []
     
     # Get lot centroids
-    centroids = [lot.centroid for lot in lots]
-    points = [[p.x, p.y] for p in centroids]
+    centroids = ctx.get('centroids') if ctx is not None else None
+    if centroids is None:
+        centroids = shapely.centroid(np.asarray(lots, dtype=object))
+    xy = shapely.get_coordinates(np.asarray(centroids, dtype=object))
+    points = xy.tolist()
     
     # Build full graph with nearby connections
     G = nx.Graph()
-    for i, p in enumerate(centroids):
-        G.add_node(i, pos=(p.x, p.y))
+    G.add_nodes_from((i, {'pos': tuple(p)}) for i, p in enumerate(points))
     
-    # Add edges for all pairs within max distance
-    for i in range(len(centroids)):
-        for j in range(i + 1, len(centroids)):
-            dist = centroids[i].distance(centroids[j])
-            if dist < max_dist:
-                G.add_edge(i, j, weight=dist)
+    # Candidate pairs within max distance from a spatial index, ordered (i, j)
+    tree = shapely.STRtree(centroids)
+    src, dst = tree.query(centroids, predicate='dwithin', distance=max_dist)
+    pair_mask = src < dst
+    src, dst = src[pair_mask], dst[pair_mask]
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    
+    delta = xy[dst] - xy[src]
+    dists = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+    close = dists < max_dist
+    G.add_weighted_edges_from(zip(src[close].tolist(), dst[close].tolist(), dists[close].tolist()))
     
     # Handle disconnected graph
     if not nx.is_connected(G):
@@ -91,10 +102,8 @@ def generate_loop_network(
                 break
     
     # Convert to LineStrings
-    connections = []
-    for u, v in loop_graph.edges():
-        if u < len(centroids) and v < len(centroids):
-            connections.append(LineString([centroids[u], centroids[v]]))
+    edge_idx = np.array(list(loop_graph.edges()), dtype=np.intp).reshape(-1, 2)
+    connections = list(shapely.linestrings(xy[edge_idx]))
     
     logger.debug(f"Generated network: {len(connections)} connections, {added_count} redundant")
     return points, connections
@@ -6,9 +6,10 @@ lots within a defined service radius.
 """
 
 import logging
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Dict, Any, Optional
 
 import numpy as np
+import shapely
 from sklearn.cluster import KMeans
 from shapely.geometry import Polygon
 
@@ -20,7 +21,8 @@ logger = logging.getLogger(__name__)
 def generate_transformers(
     lots: List[Polygon],
     lots_per_transformer: Optional[int] = None,
-    service_radius: Optional[float] = None
+    service_radius: Optional[float] = None,
+    ctx: Optional[Dict[str, Any]] = None
 ) -> List[Tuple[float, float]]:
     """
     Cluster lots to determine optimal transformer placements.
@@ -31,6 +33,7 @@ def generate_transformers(
         lots: List of lot polygons
         lots_per_transformer: Approximate lots per transformer
         service_radius: Service radius (for reference, not used in clustering)
+        ctx: Precomputed lot artifacts shared across planners (optional)
         
     Returns:
         List of (x, y) transformer locations
@@ -41,16 +44,15 @@ def generate_transformers(
     if not lots:
         return []
     
+    # Get lot centroids
+    centroids = ctx.get('centroids') if ctx is not None else None
+    if centroids is None:
+        centroids = shapely.centroid(np.asarray(lots, dtype=object))
+    lot_coords = shapely.get_coordinates(np.asarray(centroids, dtype=object))
+    
     if len(lots) == 1:
         # Single lot - transformer at centroid
-        c = lots[0].centroid
-        return [(c.x, c.y)]
-    
-    # Get lot centroids
-    lot_coords = np.array([
-        [lot.centroid.x, lot.centroid.y] 
-        for lot in lots
-    ])
+        return [tuple(lot_coords[0].tolist())]
     
     # Calculate number of transformers
     num_transformers = max(1, len(lots) // lots_per_tf)
@@ -7,7 +7,7 @@ while minimizing fragmented blocks.
 
 import random
 import logging
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
 from shapely.geometry import Polygon, Point
@@ -19,6 +19,130 @@ from core.config.settings import OptimizationSettings, DEFAULT_SETTINGS
 logger = logging.getLogger(__name__)
 
 
+def _pareto_ranks(dominates: np.ndarray) -> np.ndarray:
+    """
+    Non-dominated sorting from a precomputed dominance matrix.
+    
+    Peels fronts off the matrix with array operations instead of DEAP's
+    pairwise Python comparisons.
+    
+    Args:
+        dominates: (n, n) bool array, dominates[i, j] if i dominates j
+        
+    Returns:
+        (n,) array of front indices (0 = Pareto front)
+    """
+    dominated_by = dominates.sum(axis=0)
+    ranks = np.full(len(dominates), -1, dtype=int)
+    remaining = np.ones(len(dominates), dtype=bool)
+    rank = 0
+    
+    while remaining.any():
+        front = remaining & (dominated_by == 0)
+        ranks[front] = rank
+        remaining &= ~front
+        dominated_by -= dominates[front].sum(axis=0)
+        rank += 1
+    
+    return ranks
+
+
+def _crowding_distance(values: np.ndarray) -> np.ndarray:
+    """
+    Crowding distance of one front, computed with a per-objective sort + diff.
+    
+    Matches DEAP's assignCrowdingDist, including its tie-breaking: each
+    objective is stably sorted starting from the previous objective's order.
+    
+    Args:
+        values: (n, n_obj) array of fitness values, in front order
+        
+    Returns:
+        (n,) array of crowding distances
+    """
+    n_obj = values.shape[1]
+    distances = np.zeros(len(values))
+    order = np.arange(len(values))
+    
+    for obj in range(n_obj):
+        order = order[np.argsort(values[order, obj], kind='stable')]
+        sorted_v = values[order, obj]
+        distances[order[0]] = np.inf
+        distances[order[-1]] = np.inf
+        
+        span = sorted_v[-1] - sorted_v[0]
+        if span == 0:
+            continue
+        distances[order[1:-1]] += (sorted_v[2:] - sorted_v[:-2]) / (n_obj * span)
+    
+    return distances
+
+
+def select_nsga2_vectorized(individuals: list, k: int) -> list:
+    """
+    NSGA-II environmental selection (drop-in for ``tools.selNSGA2``).
+    
+    Returns the same individuals in the same order as DEAP: fronts in
+    sortNondominated order, with only the last (partial) front sorted by
+    crowding distance. varAnd mates neighbours, so the order is part of
+    the seeded search path.
+    
+    Args:
+        individuals: DEAP individuals with evaluated fitness
+        k: Number of individuals to select
+        
+    Returns:
+        Selected individuals
+    """
+    if not individuals or k == 0:
+        return []
+    
+    # Individuals sharing a fitness move together, keyed by first appearance
+    groups: Dict[Tuple[float, ...], List[int]] = {}
+    for i, ind in enumerate(individuals):
+        groups.setdefault(ind.fitness.wvalues, []).append(i)
+    members = list(groups.values())
+    sizes = np.array([len(m) for m in members])
+    
+    wvalues = np.array(list(groups), dtype=float)
+    geq = (wvalues[:, None, :] >= wvalues[None, :, :]).all(axis=-1)
+    gt = (wvalues[:, None, :] > wvalues[None, :, :]).any(axis=-1)
+    dominates = geq & gt  # dominates[i, j]: i dominates j
+    ranks = _pareto_ranks(dominates)
+    
+    # Fronts are only sorted until k individuals are covered
+    n_needed = min(len(individuals), k)
+    front = np.flatnonzero(ranks == 0)
+    fronts = [front]
+    n_sorted = sizes[front].sum()
+    while n_sorted < n_needed:
+        nxt = np.flatnonzero(ranks == len(fronts))
+        # DEAP releases a fitness when its last dominator in the previous
+        # front is visited, then in order of first appearance
+        position = np.arange(len(front))[:, None]
+        last = np.where(dominates[front][:, nxt], position, -1).max(axis=0)
+        front = nxt[np.lexsort((nxt, last))]
+        fronts.append(front)
+        n_sorted += sizes[front].sum()
+    
+    chosen = []
+    for i, front in enumerate(fronts):
+        front_inds = [individuals[j] for f in front for j in members[f]]
+        values = np.array([ind.fitness.values for ind in front_inds], dtype=float)
+        crowding = _crowding_distance(values)
+        for ind, dist in zip(front_inds, crowding):
+            ind.fitness.crowding_dist = float(dist)
+        
+        if i < len(fronts) - 1:
+            chosen.extend(front_inds)
+        else:
+            # Most isolated first; stable, like sorted(..., reverse=True)
+            order = np.argsort(-crowding, kind='stable')
+            chosen.extend(front_inds[j] for j in order[:k - len(chosen)])
+    
+    return chosen
+
+
 class GridOptimizer:
     """
     Stage 1: Optimize grid layout using NSGA-II genetic algorithm.
@@ -130,7 +254,10 @@ class GridOptimizer:
                 indpb=0.2
             )
             
-        self.toolbox.register("select", tools.selNSGA2)
+        if self.settings.use_vectorized_nsga2:
+            self.toolbox.register("select", select_nsga2_vectorized)
+        else:
+            self.toolbox.register("select", tools.selNSGA2)
     
     def generate_grid_candidates(
         self, 
@@ -269,8 +396,10 @@ class GridOptimizer:
                 cxpb=self.settings.crossover_probability, 
                 mutpb=self.settings.mutation_probability
             )
-            fits = list(map(self.toolbox.evaluate, offspring))
-            for ind, fit in zip(offspring, fits):
+            # Only re-evaluate individuals touched by crossover/mutation
+            invalid = [ind for ind in offspring if not ind.fitness.valid]
+            fits = list(map(self.toolbox.evaluate, invalid))
+            for ind, fit in zip(invalid, fits):
                 ind.fitness.values = fit
             pop = self.toolbox.select(pop + offspring, k=len(pop))
             
@@ -6,6 +6,7 @@ respecting minimum/maximum constraints.
 """
 
 import logging
+import math
 from typing import List, Dict, Any, Optional
 
 import numpy as np
@@ -16,6 +17,8 @@ from core.config.settings import (
     SubdivisionSettings, 
     DEFAULT_SETTINGS,
     DEVIATION_PENALTY_WEIGHT,
+    SOLVER_AREA_PER_WORKER,
+    SOLVER_MAX_SEARCH_WORKERS,
 )
 from core.geometry.orthogonal_slicer import orthogonal_slice
 from core.geometry.shape_quality import get_obb_dimensions
@@ -40,7 +43,8 @@ class SubdivisionSolver:
         max_width: float, 
         target_width: float, 
         time_limit: float = 5.0,
-        deviation_penalty_weight: float = DEVIATION_PENALTY_WEIGHT
+        deviation_penalty_weight: float = DEVIATION_PENALTY_WEIGHT,
+        num_workers: Optional[int] = None
     ) -> List[float]:
         """
         Solve optimal lot widths using constraint programming.
@@ -55,6 +59,7 @@ class SubdivisionSolver:
             target_width: Target lot width
             time_limit: Solver time limit in seconds
             deviation_penalty_weight: Weight for deviation penalty (higher = more uniform)
+            num_workers: CP-SAT search workers (None = solver default)
             
         Returns:
             List of lot widths
@@ -131,6 +136,8 @@ class SubdivisionSolver:
         # Solve
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = time_limit
+        if num_workers is not None:
+            solver.parameters.num_workers = num_workers
         status = solver.Solve(model)
         
         # Extract solution
@@ -147,6 +154,50 @@ class SubdivisionSolver:
             num_lots = max(1, int(total_length / target_width))
             return [total_length / num_lots] * num_lots
     
+    @staticmethod
+    def solve_uniform_widths(
+        total_length: float, 
+        min_width: float, 
+        max_width: float, 
+        target_width: float
+    ) -> List[float]:
+        """
+        Closed-form lot widths for the CP-SAT subdivision objective.
+        
+        With the sum of widths fixed, the CP model only trades deviation of
+        used lots against the flat penalty of unused ones. The optimum is
+        reached by the fewest equal lots that are no wider than target.
+        Used for near-rectangular blocks, where strip layout needs no search.
+        
+        Args:
+            total_length: Total length to subdivide
+            min_width: Minimum lot width
+            max_width: Maximum lot width
+            target_width: Target lot width
+            
+        Returns:
+            List of lot widths
+        """
+        if total_length <= 0 or min_width <= 0:
+            return []
+        if total_length < min_width or min_width > max_width:
+            return []
+        if target_width < min_width or target_width > max_width:
+            target_width = (min_width + max_width) / 2
+        
+        eps = 1e-9
+        n_min = max(1, math.ceil(total_length / max_width - eps))
+        n_max = math.floor(total_length / min_width + eps)
+        
+        if n_min > n_max:
+            # No feasible count, same uniform fallback as the CP path
+            num_lots = max(1, int(total_length / target_width))
+        else:
+            num_lots = math.ceil(total_length / target_width - eps)
+            num_lots = min(max(num_lots, n_min), n_max)
+        
+        return [total_length / num_lots] * num_lots
+    
     @staticmethod
     def subdivide_block(
         block_geom: Polygon, 
@@ -155,7 +206,9 @@ class SubdivisionSolver:
         max_width: float, 
         target_width: float, 
         time_limit: float = 5.0,
-        setback_dist: float = 6.0
+        setback_dist: float = 6.0,
+        analytic: bool = False,
+        max_search_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Subdivide a block into lots.
@@ -168,6 +221,9 @@ class SubdivisionSolver:
             target_width: Target lot width
             time_limit: Solver time limit
             setback_dist: Building setback distance
+            analytic: Use closed-form widths instead of CP-SAT (rectangular blocks)
+            max_search_workers: Cap on CP-SAT search workers
+                (None = SOLVER_MAX_SEARCH_WORKERS)
             
         Returns:
             Dictionary with subdivision info:
@@ -204,12 +260,23 @@ class SubdivisionSolver:
         # We assume we cut along the dominant edge (length).
         _, total_length, _ = get_obb_dimensions(block_geom)
         
-        # Adaptive time limit based on block size
-        adaptive_time = min(time_limit, max(0.5, total_length / 100))
-        
-        lot_widths = SubdivisionSolver.solve_subdivision(
-            total_length, min_width, max_width, target_width, adaptive_time
-        )
+        if analytic:
+            lot_widths = SubdivisionSolver.solve_uniform_widths(
+                total_length, min_width, max_width, target_width
+            )
+        else:
+            # Adaptive time limit and search workers based on block size
+            adaptive_time = min(time_limit, max(0.5, total_length / 100))
+            if max_search_workers is None:
+                max_search_workers = SOLVER_MAX_SEARCH_WORKERS
+            num_workers = max(1, min(
+                max_search_workers, int(current_area / SOLVER_AREA_PER_WORKER)
+            ))
+            
+            lot_widths = SubdivisionSolver.solve_subdivision(
+                total_length, min_width, max_width, target_width, adaptive_time,
+                num_workers=num_workers
+            )
         
         # Use Orthogonal Slicer to generate lot geometries
         raw_lots = orthogonal_slice(block_geom, lot_widths)
@@ -3,6 +3,7 @@
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from api.schemas.response_schemas import HealthResponse
 from api.routes import optim_router, dxf_router
@@ -29,6 +30,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress GeoJSON responses; level 5 keeps most of the ratio at far less CPU than 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routes
 app.include_router(optim_router, prefix="/api")
 app.include_router(dxf_router, prefix="/api")
@@ -7,14 +7,22 @@ Coordinates all stages of the optimization pipeline:
 3. Infrastructure planning (MST, Transformers, Drainage)
 """
 
+import hashlib
 import logging
+import multiprocessing
+import os
 import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Any, Tuple, Optional
 
 import math
 import numpy as np
-from shapely.geometry import Polygon, Point, mapping
-from shapely.ops import unary_union
+import orjson
+import shapely
+from shapely.geometry import Polygon, Point
 
 from core.config.settings import (
     AlgorithmSettings, 
@@ -23,30 +31,37 @@ from core.config.settings import (
     ROAD_INTERNAL_WIDTH,  # This is usually the road width between blocks
     SIDEWALK_WIDTH,
     TURNING_RADIUS,
+    VORONOI_CELL_SIZE,
+    SMOOTHING_QUAD_SEGS,
     SERVICE_AREA_RATIO,
     MIN_BLOCK_AREA,
     ENABLE_LEFTOVER_MANAGEMENT,
     MIN_RECTANGULARITY,
     MAX_ASPECT_RATIO,
     MIN_LOT_AREA,
+    ANALYTIC_MIN_RECTANGULARITY,
+    ANALYTIC_MAX_ASPECT_RATIO,
+    SUBDIVISION_MAX_WORKERS,
 )
 from core.geometry.polygon_utils import (
     get_elevation,
-    normalize_geometry_list,
-    filter_by_min_area,
-    sort_by_elevation,
+    extract_polygons_by_min_area,
+    cached_union,
+    batch_line_coords,
+    batch_exterior_coords,
+    geometry_to_geojson_fragment,
 )
 from core.geometry.shape_quality import (
     analyze_shape_quality,
     classify_lot_type,
     get_dominant_edge_vector,
+    is_near_rectangular,
 )
 from core.geometry.voronoi import (
     generate_voronoi_seeds,
-    create_voronoi_diagram,
-    extract_voronoi_edges,
-    classify_road_type,
-    create_road_buffer,
+    create_voronoi_edges,
+    classify_road_types,
+    create_road_buffers,
 )
 from core.optimization.grid_optimizer import GridOptimizer
 from core.optimization.subdivision_solver import SubdivisionSolver
@@ -56,6 +71,72 @@ from core.infrastructure.drainage_planner import calculate_drainage
 
 logger = logging.getLogger(__name__)
 
+# Stage 1 results by (site, config, settings); NSGA-II is seeded, so a
+# repeated /stage1 -> /optimize on the same plot can reuse the result
+_STAGE1_CACHE_SIZE = 16
+_stage1_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_stage1_cache_lock = threading.Lock()
+
+def _service_split(areas: np.ndarray, target: float) -> int:
+    """
+    Number of leading blocks allocated to service use.
+    
+    Blocks are taken in order while the accumulated area is still below
+    the target, so the block that crosses the target is included.
+    
+    Args:
+        areas: Block areas in allocation order
+        target: Service area target (m²)
+        
+    Returns:
+        Split index: blocks[:split] are service, blocks[split:] commercial
+    """
+    if target <= 0:
+        return 0
+    # First prefix sum reaching the target, via binary search
+    split = int(np.searchsorted(np.cumsum(areas), target)) + 1
+    return min(split, areas.shape[0])
+
+
+def _subdivide_block_task(args: Tuple) -> Dict[str, Any]:
+    """Process-pool entry point: subdivide one block shipped as WKB.
+    
+    Blocks already run one per process, so each CP-SAT solve gets a single
+    search worker instead of up to SOLVER_MAX_SEARCH_WORKERS.
+    """
+    block_wkb, *params, analytic = args
+    return SubdivisionSolver.subdivide_block(
+        shapely.from_wkb(block_wkb), *params, analytic=analytic, max_search_workers=1
+    )
+
+
+# Worker processes for per-block CP-SAT, shared by all pipeline runs. They
+# are spawned rather than forked: the pipeline runs on API worker threads,
+# and forking a threaded process can deadlock the child on an inherited lock.
+_subdivision_pool: Optional[ProcessPoolExecutor] = None
+_subdivision_pool_lock = threading.Lock()
+
+
+def _get_subdivision_pool() -> ProcessPoolExecutor:
+    """Shared process pool for block subdivision (created on first use)."""
+    global _subdivision_pool
+    with _subdivision_pool_lock:
+        if _subdivision_pool is None:
+            _subdivision_pool = ProcessPoolExecutor(
+                max_workers=SUBDIVISION_MAX_WORKERS or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _subdivision_pool
+
+
+def _discard_subdivision_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next run starts a fresh one."""
+    global _subdivision_pool
+    with _subdivision_pool_lock:
+        if _subdivision_pool is pool:
+            _subdivision_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 class LandRedistributionPipeline:
     """
@@ -80,13 +161,42 @@ class LandRedistributionPipeline:
             config: API configuration dictionary
             settings: Algorithm settings (optional)
         """
-        self.land_poly = unary_union(land_polygons)
+        # Geometry array goes straight to the vectorized GEOS union
+        self.land_poly = cached_union(land_polygons)
+        # Prepared index is reused by every predicate/overlay against the site
+        shapely.prepare(self.land_poly)
         self.config = config
         self.settings = settings or AlgorithmSettings.from_dict(config)
         self.lake_poly = Polygon()  # No lake by default
         
+        # Centroid elevation per block, keyed by id() (block kept to guard id reuse)
+        self._elev_cache: Dict[int, Tuple[Polygon, float]] = {}
+        
         logger.info(f"Pipeline initialized with land area: {self.land_poly.area:.2f} m²")
     
+    def _elevations(self, blocks: List[Polygon]) -> np.ndarray:
+        """Centroid elevations of blocks, memoized per pipeline."""
+        missing = [
+            b for b in blocks
+            if self._elev_cache.get(id(b), (None,))[0] is not b
+        ]
+        
+        if missing:
+            # One vectorized centroid + elevation pass for all cache misses
+            centroids = shapely.centroid(np.asarray(missing, dtype=object))
+            elevations = get_elevation(shapely.get_x(centroids), shapely.get_y(centroids))
+            for block, elevation in zip(missing, elevations.tolist()):
+                self._elev_cache[id(block)] = (block, elevation)
+        
+        return np.fromiter(
+            (self._elev_cache[id(b)][1] for b in blocks), dtype=np.float64, count=len(blocks)
+        )
+    
+    def _sort_by_elevation(self, blocks: List[Polygon]) -> List[Polygon]:
+        """Sort blocks by cached centroid elevation (lowest first)."""
+        order = np.argsort(self._elevations(blocks), kind='stable')
+        return [blocks[i] for i in order]
+    
     def generate_road_network(
         self, 
         num_seeds: int = 15
@@ -105,70 +215,68 @@ class LandRedistributionPipeline:
         # Generate Voronoi seeds
         seeds = generate_voronoi_seeds(site, num_seeds)
         
-        # Create Voronoi diagram
-        regions = create_voronoi_diagram(seeds, site)
-        if regions is None:
-            logger.warning("Voronoi generation failed, returning empty")
-            return Polygon(), [], [site]
-        
-        # Extract edges
-        edges = extract_voronoi_edges(regions)
+        # Create Voronoi edges (GEOS emits the edges directly)
+        edges = create_voronoi_edges(seeds, site)
         if not edges:
+            logger.warning("Voronoi generation failed, returning empty")
             return Polygon(), [], [site]
         
-        # Create road buffers
-        center = site.centroid
-        road_polys = []
-        
-        for line in edges:
-            road_type = classify_road_type(line, center)
-            road_buffer = create_road_buffer(
-                line, 
-                road_type,
-                main_width=ROAD_MAIN_WIDTH,
-                internal_width=ROAD_INTERNAL_WIDTH,
-                sidewalk_width=SIDEWALK_WIDTH
-            )
-            road_polys.append(road_buffer)
+        # Create road buffers (one vectorized GEOS call for all edges)
+        edges = np.asarray(edges, dtype=object)
+        is_main = classify_road_types(edges, site.centroid)
+        road_polys = create_road_buffers(
+            edges,
+            is_main,
+            main_width=ROAD_MAIN_WIDTH,
+            internal_width=ROAD_INTERNAL_WIDTH,
+            sidewalk_width=SIDEWALK_WIDTH,
+            turning_radius=TURNING_RADIUS,
+            quad_segs=SMOOTHING_QUAD_SEGS
+        )
         
-        if not road_polys:
-            return Polygon(), [], [site]
+        # Drop buffers that cannot affect the site. The zone is padded by
+        # TURNING_RADIUS so the erosion below sees every buffer it needs.
+        clip_zone = site.buffer(TURNING_RADIUS)
+        tree = shapely.STRtree(road_polys)
+        keep_idx = np.sort(tree.query(clip_zone, predicate='intersects'))
+        road_polys = road_polys[keep_idx]
         
-        # Merge road network
-        network_poly = unary_union(road_polys)
+        # Merge road network (buffers are already dilated by TURNING_RADIUS)
+        network_poly = shapely.unary_union(road_polys)
         
-        # Apply turning radius smoothing
+        # Apply turning radius smoothing: erosion completes the closing
         smooth_network = network_poly.buffer(
-            TURNING_RADIUS, join_style=1
-        ).buffer(-TURNING_RADIUS, join_style=1)
+            -TURNING_RADIUS, join_style=1, quad_segs=SMOOTHING_QUAD_SEGS
+        )
+        
+        # Keep the network bounded to the site for the difference below
+        smooth_network = shapely.intersection(smooth_network, clip_zone)
         
-        # Extract blocks (land minus roads)
-        blocks_rough = site.difference(smooth_network)
-        candidates = normalize_geometry_list(blocks_rough)
+        # Extract blocks (land minus roads). The site is prepared, so the
+        # intersects test is cheap and skips the overlay when roads miss it.
+        if site.intersects(smooth_network):
+            blocks_rough = site.difference(smooth_network)
+        else:
+            blocks_rough = site
         
-        # Filter by minimum area
-        valid_blocks = filter_by_min_area(candidates, MIN_BLOCK_AREA)
+        # Split into parts and filter by minimum area
+        valid_blocks = extract_polygons_by_min_area(blocks_rough, MIN_BLOCK_AREA)
         
         if not valid_blocks:
             return smooth_network, [], []
         
         # Sort by elevation (lowest first for WWTP)
-        sorted_blocks = sort_by_elevation(valid_blocks)
+        sorted_blocks = self._sort_by_elevation(valid_blocks)
         
         # Allocate service areas (10% of total)
-        total_area = sum(b.area for b in valid_blocks)
-        service_target = total_area * SERVICE_AREA_RATIO
-        
-        service_blocks = []
-        commercial_blocks = []
-        accumulated = 0.0
+        sorted_areas = np.fromiter(
+            (b.area for b in sorted_blocks), dtype=np.float64, count=len(sorted_blocks)
+        )
+        service_target = float(sorted_areas.sum()) * SERVICE_AREA_RATIO
         
-        for block in sorted_blocks:
-            if accumulated < service_target:
-                service_blocks.append(block)
-                accumulated += block.area
-            else:
-                commercial_blocks.append(block)
+        split = _service_split(sorted_areas, service_target)
+        service_blocks = sorted_blocks[:split]
+        commercial_blocks = sorted_blocks[split:]
         
         # Ensure at least one commercial block
         if not commercial_blocks and service_blocks:
@@ -177,8 +285,48 @@ class LandRedistributionPipeline:
         logger.info(f"Road network: {len(service_blocks)} service, {len(commercial_blocks)} commercial blocks")
         return smooth_network, service_blocks, commercial_blocks
     
+    def _stage1_key(self) -> bytes:
+        """Stable digest of everything run_stage1 depends on."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(shapely.to_wkb(self.land_poly))
+        digest.update(shapely.to_wkb(self.lake_poly))
+        digest.update(orjson.dumps(self.config, option=orjson.OPT_SORT_KEYS, default=str))
+        digest.update(repr(self.settings).encode())
+        return digest.digest()
+    
     def run_stage1(self) -> Dict[str, Any]:
-        """Run grid optimization stage (NSGA-II) with orthogonal alignment."""
+        """
+        Run grid optimization stage (NSGA-II) with orthogonal alignment.
+        
+        Results are memoized per site and configuration, so the /stage1
+        preview and the following /optimize run NSGA-II only once.
+        """
+        key = self._stage1_key()
+        with _stage1_cache_lock:
+            cached = _stage1_cache.get(key)
+            if cached is not None:
+                _stage1_cache.move_to_end(key)
+        
+        if cached is None:
+            # Not under the lock: concurrent misses on one key just recompute
+            cached = self._optimize_grid()
+            with _stage1_cache_lock:
+                _stage1_cache[key] = cached
+                if len(_stage1_cache) > _STAGE1_CACHE_SIZE:
+                    _stage1_cache.popitem(last=False)
+        else:
+            logger.info("Reusing cached Stage 1 result")
+        
+        # Fresh containers so callers cannot mutate the cached entry
+        return {
+            **cached,
+            'blocks': list(cached['blocks']),
+            'history': list(cached['history']),
+            'metrics': dict(cached['metrics'])
+        }
+    
+    def _optimize_grid(self) -> Dict[str, Any]:
+        """Run NSGA-II and cut the site into usable grid blocks."""
         
         # Calculate dominant edge angle for orthogonal alignment
         # This addresses User feedback about "uneven blocks" in Stage 1
@@ -204,27 +352,27 @@ class LandRedistributionPipeline:
         blocks = optimizer.generate_grid_candidates(spacing, angle)
         
         # Filter to usable blocks and apply road buffer
-        usable_blocks = []
         road_width = self.config.get('road_width', ROAD_INTERNAL_WIDTH)
         buffer_amount = -road_width / 2.0
         
-        for blk in blocks:
-            # Intersect with land
-            intersection = blk.intersection(self.land_poly).difference(self.lake_poly)
-            
-            if not intersection.is_empty and intersection.area > MIN_BLOCK_AREA:
-                # Apply negative buffer to create road gaps
-                # simplify(0.1) helps clean up artifacts after buffering
-                buffered_blk = intersection.buffer(buffer_amount, join_style=2).simplify(0.1)
-                
-                if not buffered_blk.is_empty:
-                    if buffered_blk.geom_type == 'Polygon':
-                         if buffered_blk.area > MIN_BLOCK_AREA:
-                            usable_blocks.append(buffered_blk)
-                    elif buffered_blk.geom_type == 'MultiPolygon':
-                        for part in buffered_blk.geoms:
-                            if part.area > MIN_BLOCK_AREA:
-                                usable_blocks.append(part)
+        # Intersect with land and remove lake in one vectorized pass
+        clipped_blocks = shapely.difference(
+            shapely.intersection(np.asarray(blocks, dtype=object), self.land_poly),
+            self.lake_poly
+        )
+        clipped_blocks = clipped_blocks[shapely.area(clipped_blocks) > MIN_BLOCK_AREA]
+        
+        # Apply negative buffer to create road gaps
+        # simplify(0.1) helps clean up artifacts after buffering
+        buffered_blocks = shapely.simplify(
+            shapely.buffer(clipped_blocks, buffer_amount, quad_segs=16, join_style='mitre'),
+            0.1
+        )
+        
+        # Explode MultiPolygons and keep parts above the minimum area
+        parts = shapely.get_parts(buffered_blocks)
+        parts = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+        usable_blocks = parts[shapely.area(parts) > MIN_BLOCK_AREA].tolist()
         
         return {
             'spacing': spacing,
@@ -248,16 +396,7 @@ class LandRedistributionPipeline:
         parks = []
         green_spaces = []  # NEW: collect poor-quality lots (Beauti_mode Section 3)
         
-        for block in blocks:
-            result = SubdivisionSolver.subdivide_block(
-                block,
-                spacing,
-                self.config.get('min_lot_width', 20.0),
-                self.config.get('max_lot_width', 80.0),
-                self.config.get('target_lot_width', 40.0),
-                self.config.get('ortools_time_limit', 5)
-            )
-            
+        for result in self._subdivide_blocks(blocks, spacing):
             if result['type'] == 'park':
                 parks.append(result['geometry'])
             else:
@@ -291,7 +430,10 @@ class LandRedistributionPipeline:
                 if block_total > 0:
                      logger.info(f"Block Subdivision: Generated {block_total} lots -> Kept {kept_count} Commercial, {green_count} Green Space")
 
-        avg_width = np.mean([lot['width'] for lot in all_lots]) if all_lots else 0
+        # Aggregate metrics over whole arrays (vectorized GEOS area)
+        widths = np.fromiter((lot['width'] for lot in all_lots), dtype=np.float64, count=len(all_lots))
+        lot_geoms = np.asarray([lot['geometry'] for lot in all_lots], dtype=object)
+        buildable_geoms = np.asarray([lot['buildable'] for lot in all_lots], dtype=object)
         
         return {
             'lots': all_lots,
@@ -301,10 +443,69 @@ class LandRedistributionPipeline:
                 'total_lots': len(all_lots),
                 'total_parks': len(parks),
                 'total_green_spaces': len(green_spaces),
-                'avg_lot_width': avg_width
+                'avg_lot_width': float(widths.mean()) if len(widths) else 0,
+                # Missing setbacks (None) have NaN area
+                'total_lot_area': float(shapely.area(lot_geoms).sum()),
+                'total_buildable_area': float(np.nansum(shapely.area(buildable_geoms))),
+                'total_park_area': float(shapely.area(np.asarray(parks, dtype=object)).sum()),
+                'total_green_area': float(shapely.area(np.asarray(green_spaces, dtype=object)).sum())
             }
         }
     
+    def _subdivide_blocks(
+        self, 
+        blocks: List[Polygon], 
+        spacing: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Subdivide blocks, running CP-SAT blocks in parallel processes.
+        
+        Near-rectangular blocks use the analytic strip layout in-process;
+        the remaining blocks are independent CP-SAT solves and are farmed
+        out to the shared process pool (as WKB) when there is more than one.
+        
+        Returns:
+            Subdivision results in the same order as blocks
+        """
+        params = (
+            spacing,
+            self.config.get('min_lot_width', 20.0),
+            self.config.get('max_lot_width', 80.0),
+            self.config.get('target_lot_width', 40.0),
+            self.config.get('ortools_time_limit', 5),
+        )
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(blocks)
+        solver_idx = []
+        
+        for i, block in enumerate(blocks):
+            # Near-rectangular blocks get a strip layout without CP-SAT
+            if is_near_rectangular(
+                block,
+                min_rectangularity=ANALYTIC_MIN_RECTANGULARITY,
+                max_aspect_ratio=ANALYTIC_MAX_ASPECT_RATIO
+            ):
+                results[i] = SubdivisionSolver.subdivide_block(block, *params, analytic=True)
+            else:
+                solver_idx.append(i)
+        
+        if len(solver_idx) > 1 and (SUBDIVISION_MAX_WORKERS or os.cpu_count() or 1) > 1:
+            tasks = [(blocks[i].wkb, *params, False) for i in solver_idx]
+            pool = _get_subdivision_pool()
+            try:
+                for i, result in zip(solver_idx, pool.map(_subdivide_block_task, tasks)):
+                    results[i] = result
+                solver_idx = []
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    _discard_subdivision_pool(pool)
+                logger.warning(f"Parallel subdivision failed ({e}), solving blocks serially")
+        
+        for i in solver_idx:
+            results[i] = SubdivisionSolver.subdivide_block(blocks[i], *params, analytic=False)
+        
+        return results
+    
     def classify_blocks(
         self, 
         blocks: List[Polygon]
@@ -313,11 +514,10 @@ class LandRedistributionPipeline:
         if not blocks:
             return {'service': [], 'commercial': [], 'xlnt': []}
         
-        sorted_blocks = sort_by_elevation(blocks)
+        sorted_blocks = self._sort_by_elevation(blocks)
+        areas = shapely.area(np.asarray(sorted_blocks, dtype=object))
         
-        total_area = sum(b.area for b in blocks)
-        service_target = total_area * SERVICE_AREA_RATIO
-        accumulated = 0.0
+        service_target = float(areas.sum()) * SERVICE_AREA_RATIO
         
         xlnt_block = []
         service_blocks = []
@@ -327,7 +527,6 @@ class LandRedistributionPipeline:
         if sorted_blocks:
             xlnt = sorted_blocks.pop(0)
             xlnt_block.append(xlnt)
-            accumulated += xlnt.area
         
         # Fill remaining service quota
         # Distribute service blocks (Interleave)
@@ -340,7 +539,7 @@ class LandRedistributionPipeline:
         if num_remaining > 0:
             # Calculate how many service blocks we need
             # We use checks against area, but let's approximate by count for mixing
-            avg_area = sum(b.area for b in remaining_blocks) / num_remaining
+            avg_area = float(areas[1:].mean())
             service_count = int(service_target / avg_area)
             service_count = max(1, min(service_count, int(num_remaining * 0.3))) # Cap at 30%
             
@@ -350,12 +549,16 @@ class LandRedistributionPipeline:
             else:
                 # Step size for distribution
                 step = num_remaining / service_count
-                indices = [int(i * step) for i in range(service_count)]
-                
+                indices = (np.arange(service_count) * step).astype(int)
+
                 logger.info(f"Classification: Total={num_remaining}, ServiceTarget={service_count}, Step={step:.2f}")
-                
-                for i, block in enumerate(remaining_blocks):
-                    if i in indices:
+
+                # Boolean mask avoids an O(N*S) list membership test per block
+                service_mask = np.zeros(num_remaining, dtype=bool)
+                service_mask[indices] = True
+
+                for block, is_service in zip(remaining_blocks, service_mask):
+                    if is_service:
                         service_blocks.append(block)
                     else:
                         commercial_blocks.append(block)
@@ -371,21 +574,10 @@ class LandRedistributionPipeline:
             'commercial': commercial_blocks
         }
     
-    @staticmethod
-    def _safe_coords(geom):
-        """Helper to safely extract coordinates for JSON serialization."""
-        if geom.geom_type == 'Polygon':
-            return list(geom.exterior.coords)
-        elif geom.geom_type == 'MultiPolygon':
-            # Return exterior of the largest part
-            largest = max(geom.geoms, key=lambda p: p.area)
-            return list(largest.exterior.coords)
-        return []
-
     def run_full_pipeline(
         self, 
         layout_method: str = 'auto',  # 'auto', 'voronoi', 'grid'
-        num_seeds: int = 15
+        num_seeds: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run complete optimization pipeline.
@@ -393,9 +585,20 @@ class LandRedistributionPipeline:
         Args:
             layout_method: Strategy for road network ('voronoi' or 'grid')
             num_seeds: Number of seeds for Voronoi generation
+                (default: scaled to the site area)
         """
         logger.info(f"Starting full pipeline with method: {layout_method}")
         
+        site_area = self.land_poly.area
+        if num_seeds is None:
+            # One seed per typical Voronoi block
+            num_seeds = max(5, int(site_area / VORONOI_CELL_SIZE ** 2))
+        
+        # Sites too small to hold the Voronoi blocks go straight to grid
+        if layout_method == 'auto' and site_area / MIN_BLOCK_AREA < 2 * num_seeds:
+            logger.info("Site too small for Voronoi layout, using grid-based")
+            layout_method = 'grid'
+        
         road_network = Polygon()
         service_blocks_voronoi = []
         commercial_blocks_voronoi = []
@@ -423,7 +626,7 @@ class LandRedistributionPipeline:
             service_blocks_voronoi = classification['service']
             xlnt_blocks = classification['xlnt']
             all_blocks = stage1_result['blocks']
-            road_network = self.land_poly.difference(unary_union(all_blocks))
+            road_network = self.land_poly.difference(cached_union(all_blocks))
             spacing_for_subdivision = stage1_result['spacing']
         else:
             # Separate XLNT from service blocks for Voronoi path
@@ -434,7 +637,7 @@ class LandRedistributionPipeline:
             # Estimate spacing for subdivision
             if commercial_blocks_voronoi:
                 # Use a heuristic for Voronoi block spacing
-                avg_area = sum(b.area for b in commercial_blocks_voronoi) / len(commercial_blocks_voronoi)
+                avg_area = float(shapely.area(np.asarray(commercial_blocks_voronoi, dtype=object)).mean())
                 spacing_for_subdivision = max(20.0, (avg_area ** 0.5) * 0.7)
             else:
                 spacing_for_subdivision = 25.0
@@ -452,21 +655,31 @@ class LandRedistributionPipeline:
         
         infra_polys = [item['geometry'] for item in all_network_nodes]
         
+        # Shared per-lot artifacts, computed once for all Stage 3 planners
+        infra_ctx = {
+            'centroids': shapely.centroid(np.asarray(infra_polys, dtype=object)),
+        }
+        
         # Stage 3: Infrastructure
-        points, connections = generate_loop_network(infra_polys)
-        transformers = generate_transformers(infra_polys)
+        points, connections = generate_loop_network(infra_polys, ctx=infra_ctx)
+        transformers = generate_transformers(infra_polys, ctx=infra_ctx)
         
         wwtp_center = xlnt_blocks[0].centroid if xlnt_blocks else None
-        drainage = calculate_drainage(infra_polys, wwtp_center)
+        drainage = calculate_drainage(infra_polys, wwtp_center, ctx=infra_ctx)
         
         logger.info(f"Pipeline complete: {len(stage2_result['lots'])} lots, {len(connections)} connections")
         
+        all_blocks = commercial_blocks_voronoi + service_blocks_voronoi + xlnt_blocks
+        # Kept as float arrays; serialized by orjson without boxing each vertex
+        connection_coords = batch_line_coords(connections, as_arrays=True)
+        service_coords = batch_exterior_coords(service_blocks_voronoi)
+        xlnt_coords = batch_exterior_coords(xlnt_blocks)
+        road_geojson = geometry_to_geojson_fragment(road_network)
+        
         return {
             'stage1': {
-                'blocks': commercial_blocks_voronoi + service_blocks_voronoi + xlnt_blocks,
-                'metrics': {
-                    'total_blocks': len(commercial_blocks_voronoi) + len(service_blocks_voronoi) + len(xlnt_blocks)
-                },
+                'blocks': all_blocks,
+                'metrics': {'total_blocks': len(all_blocks)},
                 'spacing': spacing_for_subdivision,
                 'angle': 0.0
             },
@@ -480,13 +693,12 @@ class LandRedistributionPipeline:
             },
             'stage3': {
                 'points': points,
-                'connections': [list(line.coords) for line in connections],
+                'connections': connection_coords,
                 'drainage': drainage,
                 'transformers': transformers,
-                'road_network': mapping(road_network)
+                'road_network': road_geojson
             },
             'total_lots': stage2_result['metrics']['total_lots'],
-            'total_lots': stage2_result['metrics']['total_lots'],
-            'service_blocks': [self._safe_coords(b) for b in service_blocks_voronoi],
-            'xlnt_blocks': [self._safe_coords(b) for b in xlnt_blocks]
+            'service_blocks': service_coords,
+            'xlnt_blocks': xlnt_coords
         }
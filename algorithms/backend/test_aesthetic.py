@@ -12,7 +12,8 @@ def test_shape_quality():
             analyze_shape_quality,
             get_dominant_edge_vector,
             classify_lot_type,
-            get_obb_dimensions
+            get_obb_dimensions,
+            is_near_rectangular
         )
         
         # Test 1: Perfect rectangle should have high score and be valid
@@ -63,6 +64,12 @@ def test_shape_quality():
         print(f"  Triangle type: {lot_type}")
         assert lot_type == 'green_space', "Bad lot (large enough) should be green_space"
         
+        # Test 8: Near-rectangular fast path detection
+        print(f"  Near-rectangular: rect={is_near_rectangular(rect)}, tri={is_near_rectangular(tri)}")
+        assert is_near_rectangular(rect), "Rectangle should take the fast path"
+        assert not is_near_rectangular(tri), "Triangle should not take the fast path"
+        assert not is_near_rectangular(elongated, max_aspect_ratio=4.0), "Elongated block should use CP-SAT"
+        
         print("✅ Shape quality tests passed")
         return True
     except Exception as e:
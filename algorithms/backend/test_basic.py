@@ -48,6 +48,11 @@ def test_algorithm():
         widths = SubdivisionSolver.solve_subdivision(50.0, 5.0, 8.0, 6.0, time_limit=5)
         print(f"  Subdivision result: {len(widths)} lots")
         
+        # Closed-form widths for rectangular blocks
+        uniform = SubdivisionSolver.solve_uniform_widths(100.0, 20.0, 80.0, 40.0)
+        print(f"  Uniform widths: {uniform}")
+        assert len(uniform) == 3 and abs(sum(uniform) - 100.0) < 1e-6
+        
         print("✅ Algorithm tests passed")
         return True
     except Exception as e:
@@ -56,6 +61,143 @@ def test_algorithm():
         return False
 
 
+def test_nsga2_selection():
+    """Test vectorized NSGA-II selection against DEAP's reference."""
+    print("\nTesting NSGA-II selection...")
+    try:
+        import random
+        from deap import creator, tools
+        from shapely.geometry import Polygon
+        from core.optimization.grid_optimizer import GridOptimizer, select_nsga2_vectorized
+        
+        # Registers DEAP creator classes
+        GridOptimizer(Polygon([(0, 0), (100, 0), (100, 100), (0, 100)]))
+        
+        random.seed(0)
+        # Coarse values so duplicates and ties exercise DEAP's ordering
+        values = [(random.randint(0, 9) * 100.0, random.randint(0, 6)) for _ in range(40)]
+        values += [(random.random() * 1000.0, random.random() * 6) for _ in range(40)]
+        
+        def make_population():
+            pop = []
+            for i, fit in enumerate(values):
+                ind = creator.Individual([i])
+                ind.fitness.values = fit
+                pop.append(ind)
+            return pop
+        
+        # varAnd mates neighbours, so the order must match, not just the set
+        for k in (1, 20, 40, 57, 80):
+            reference = tools.selNSGA2(make_population(), k)
+            selected = select_nsga2_vectorized(make_population(), k)
+            assert len(selected) == k, "Should select k individuals"
+            assert [ind[0] for ind in selected] == [ind[0] for ind in reference], \
+                f"Selection order should match DEAP (k={k})"
+            assert [ind.fitness.crowding_dist for ind in selected] == \
+                [ind.fitness.crowding_dist for ind in reference], \
+                f"Crowding distances should match DEAP (k={k})"
+        print(f"  Selected individuals match DEAP for {len(values)} candidates")
+        
+        print("✅ NSGA-II selection tests passed")
+        return True
+    except Exception as e:
+        print(f"❌ NSGA-II selection test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_road_smoothing():
+    """Test single-pass road smoothing against buffer(+r).buffer(-r)."""
+    print("\nTesting road smoothing...")
+    try:
+        import random
+        import numpy as np
+        import shapely
+        from shapely.geometry import Polygon
+        from core.geometry.voronoi import (
+            generate_voronoi_seeds,
+            create_voronoi_edges,
+            classify_road_types,
+            create_road_buffers
+        )
+        
+        random.seed(2)
+        site = Polygon([(0, 0), (400, 0), (450, 300), (100, 380), (-50, 200)])
+        edges = np.asarray(create_voronoi_edges(generate_voronoi_seeds(site, 15), site), dtype=object)
+        is_main = classify_road_types(edges, site.centroid)
+        radius = 10.0
+        
+        # Buffers pre-dilated by the radius need only the erosion pass
+        single = shapely.unary_union(create_road_buffers(edges, is_main, turning_radius=radius))
+        single = single.buffer(-radius, join_style=1).intersection(site)
+        double = shapely.unary_union(create_road_buffers(edges, is_main))
+        double = double.buffer(radius).buffer(-radius).intersection(site)
+        
+        drift = single.symmetric_difference(double).area / double.area
+        print(f"  {len(edges)} edges, area drift {drift:.2%}")
+        assert drift < 0.02, "Single-pass smoothing should match the two-pass closing"
+        
+        print("✅ Road smoothing tests passed")
+        return True
+    except Exception as e:
+        print(f"❌ Road smoothing test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_parallel_subdivision():
+    """Test that pooled block subdivision matches solving the blocks serially."""
+    print("\nTesting parallel subdivision...")
+    try:
+        from shapely.geometry import Polygon
+        from core.config.settings import ANALYTIC_MIN_RECTANGULARITY, ANALYTIC_MAX_ASPECT_RATIO
+        from core.geometry.shape_quality import is_near_rectangular
+        from core.optimization.subdivision_solver import SubdivisionSolver
+        import pipeline.land_redistribution as land_redistribution
+        from pipeline.land_redistribution import LandRedistributionPipeline
+        
+        # Skewed quadrilaterals, so every block goes to CP-SAT (and the pool)
+        blocks = [
+            Polygon([(x, 0), (x + 60, 0), (x + 90 + 5 * k, 50), (x + 10, 45)])
+            for k, x in enumerate(range(0, 600, 150))
+        ]
+        assert not any(
+            is_near_rectangular(
+                b, min_rectangularity=ANALYTIC_MIN_RECTANGULARITY, max_aspect_ratio=ANALYTIC_MAX_ASPECT_RATIO
+            )
+            for b in blocks
+        )
+        config = {'min_lot_width': 10.0, 'max_lot_width': 20.0, 'target_lot_width': 15.0, 'ortools_time_limit': 5}
+        pipeline = LandRedistributionPipeline([Polygon([(0, 0), (800, 0), (800, 100), (0, 100)])], config)
+        
+        # Two pool workers even on a single-CPU machine
+        saved_workers = land_redistribution.SUBDIVISION_MAX_WORKERS
+        land_redistribution.SUBDIVISION_MAX_WORKERS = 2
+        try:
+            pooled = pipeline._subdivide_blocks(blocks, spacing=55.0)
+            pool = land_redistribution._subdivision_pool
+            assert pool is not None, "Blocks should have been solved in the process pool"
+            pool.shutdown()
+            land_redistribution._subdivision_pool = None
+        finally:
+            land_redistribution.SUBDIVISION_MAX_WORKERS = saved_workers
+        serial = [
+            SubdivisionSolver.subdivide_block(b, 55.0, 10.0, 20.0, 15.0, 5, analytic=False, max_search_workers=1)
+            for b in blocks
+        ]
+        lot_areas = lambda result: [round(lot['geometry'].area, 6) for lot in result['lots']]
+        assert [r['type'] for r in pooled] == [r['type'] for r in serial]
+        assert [lot_areas(r) for r in pooled] == [lot_areas(r) for r in serial]
+        print(f"  {len(blocks)} blocks, {sum(len(r['lots']) for r in pooled)} lots match")
+        
+        print("✅ Parallel subdivision tests passed")
+        return True
+    except Exception as e:
+        print(f"❌ Parallel subdivision test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
 def test_api_models():
     """Test Pydantic models."""
     print("\nTesting API models...")
@@ -94,6 +236,9 @@ if __name__ == "__main__":
     results.append(("Imports", test_imports()))
     results.append(("API Models", test_api_models()))
     results.append(("Algorithm", test_algorithm()))
+    results.append(("NSGA-II Selection", test_nsga2_selection()))
+    results.append(("Road Smoothing", test_road_smoothing()))
+    results.append(("Parallel Subdivision", test_parallel_subdivision()))
     
     print("\n" + "=" * 50)
     print("Test Results:")
@@ -5,84 +5,114 @@ Based on REMB_Production_Final_Reliable.ipynb converter logic.
 
 import logging
 import ezdxf
+from ezdxf.document import Drawing
 from shapely.geometry import Polygon, mapping, LineString
 from shapely.ops import unary_union, polygonize
-from typing import Optional, List, Tuple
+from typing import BinaryIO, Optional, List, Tuple, Union
 import io
+import os
+import shutil
+import tempfile
 
 logger = logging.getLogger(__name__)
 
+# Raw DXF bytes, a binary file object (e.g. an UploadFile's spooled file),
+# or a document already parsed by read_dxf_document
+DxfSource = Union[bytes, BinaryIO, Drawing]
 
-def load_boundary_from_dxf(dxf_content: bytes) -> Optional[Polygon]:
+
+def read_dxf_document(source: Union[bytes, BinaryIO]) -> Drawing:
     """
-    Load site boundary from DXF file content.
+    Parse DXF content into an ezdxf document.
     
-    Uses the same logic as notebook's load_boundary_from_dxf function:
-    - Looks for closed LWPOLYLINE entities
-    - Returns the largest valid polygon found
+    File objects are copied to disk in chunks rather than read into memory;
+    the in-memory stream fallbacks only run if ezdxf.readfile fails.
     
     Args:
-        dxf_content: Bytes content of DXF file
+        source: DXF bytes or a binary file object positioned at the start
         
     Returns:
-        Shapely Polygon or None if no valid boundary found
+        Parsed ezdxf document
+        
+    Raises:
+        Exception: The last parse error if no method could read the DXF
     """
+    tmp_path = None
     try:
-        # Load DXF from bytes
         # For maximum compatibility, especially with old DXF formats (R11/R12),
         # use tempfile approach as it preserves all entity data
-        import tempfile
-        import os
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.dxf', delete=False) as tmp:
+            tmp_path = tmp.name
+            if isinstance(source, bytes):
+                tmp.write(source)
+            else:
+                shutil.copyfileobj(source, tmp)
         
-        doc = None
-        tmp_path = None
+        # Read using ezdxf.readfile (most reliable method)
+        doc = ezdxf.readfile(tmp_path)
+        logger.info("Successfully loaded DXF using tempfile method")
+        return doc
         
+    except Exception as e:
+        logger.warning(f"Tempfile method failed: {e}, trying stream methods")
+    finally:
+        # Clean up temp file
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    if isinstance(source, bytes):
+        dxf_content = source
+    else:
+        source.seek(0)
+        dxf_content = source.read()
+    
+    # Fallback: Try stream methods
+    encodings = ['utf-8', 'latin-1', 'cp1252', 'utf-16']
+    
+    for encoding in encodings:
         try:
-            # Write bytes to temporary file
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.dxf', delete=False) as tmp:
-                tmp.write(dxf_content)
-                tmp_path = tmp.name
-            
-            # Read using ezdxf.readfile (most reliable method)
-            doc = ezdxf.readfile(tmp_path)
-            logger.info("Successfully loaded DXF using tempfile method")
-            
-        except Exception as e:
-            logger.warning(f"Tempfile method failed: {e}, trying stream methods")
-            
-            # Fallback: Try stream methods
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'utf-16']
-            
-            for encoding in encodings:
-                try:
-                    text_content = dxf_content.decode(encoding)
-                    text_stream = io.StringIO(text_content)
-                    doc = ezdxf.read(text_stream)
-                    logger.info(f"Successfully loaded DXF with {encoding} encoding")
-                    break
-                except (UnicodeDecodeError, AttributeError):
-                    continue
-                except Exception:
-                    continue
-            
-            # Last resort: Binary stream
-            if doc is None:
-                try:
-                    dxf_stream = io.BytesIO(dxf_content)
-                    doc = ezdxf.read(dxf_stream)
-                    logger.info("Successfully loaded DXF in binary format")
-                except Exception as final_error:
-                    logger.error(f"Failed to load DXF in any format: {final_error}")
-                    return None
-        finally:
-            # Clean up temp file
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
+            text_content = dxf_content.decode(encoding)
+            doc = ezdxf.read(io.StringIO(text_content))
+            logger.info(f"Successfully loaded DXF with {encoding} encoding")
+            return doc
+        except Exception:
+            continue
+    
+    # Last resort: Binary stream
+    doc = ezdxf.read(io.BytesIO(dxf_content))
+    logger.info("Successfully loaded DXF in binary format")
+    return doc
+
+
+def _as_document(source: DxfSource) -> Drawing:
+    """Return source unchanged if already parsed, otherwise parse it."""
+    if isinstance(source, Drawing):
+        return source
+    return read_dxf_document(source)
+
+
+def load_boundary_from_dxf(dxf_content: DxfSource) -> Optional[Polygon]:
+    """
+    Load site boundary from DXF file content.
+    
+    Uses the same logic as notebook's load_boundary_from_dxf function:
+    - Looks for closed LWPOLYLINE entities
+    - Returns the largest valid polygon found
+    
+    Args:
+        dxf_content: DXF bytes, binary file object, or parsed document
         
-        if doc is None:
+    Returns:
+        Shapely Polygon or None if no valid boundary found
+    """
+    try:
+        try:
+            doc = _as_document(dxf_content)
+        except Exception as final_error:
+            logger.error(f"Failed to load DXF in any format: {final_error}")
             return None
         
         msp = doc.modelspace()
@@ -275,57 +305,22 @@ def export_to_dxf(geometries: List[dict], output_type: str = 'final') -> bytes:
         return b''
 
 
-def validate_dxf(dxf_content: bytes) -> Tuple[bool, str]:
+def validate_dxf(dxf_content: DxfSource) -> Tuple[bool, str]:
     """
     Validate DXF file and return status.
     
     Args:
-        dxf_content: DXF file bytes
+        dxf_content: DXF bytes, binary file object, or parsed document
         
     Returns:
         (is_valid, message)
     """
     try:
-        # Load DXF for validation
-        # Use tempfile method for maximum compatibility
-        import tempfile
-        import os
-        
-        doc = None
-        tmp_path = None
-        
         try:
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.dxf', delete=False) as tmp:
-                tmp.write(dxf_content)
-                tmp_path = tmp.name
-            
-            doc = ezdxf.readfile(tmp_path)
-            
-        except Exception:
-            # Fallback to stream methods
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'utf-16']
-            
-            for encoding in encodings:
-                try:
-                    text_content = dxf_content.decode(encoding)
-                    text_stream = io.StringIO(text_content)
-                    doc = ezdxf.read(text_stream)
-                    break
-                except (UnicodeDecodeError, AttributeError, Exception):
-                    continue
-            
-            if doc is None:
-                try:
-                    dxf_stream = io.BytesIO(dxf_content)
-                    doc = ezdxf.read(dxf_stream)
-                except Exception as e:
-                    return False, f"Failed to parse DXF: {str(e)}"
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
+            doc = _as_document(dxf_content)
+        except Exception as e:
+            return False, f"Failed to parse DXF: {str(e)}"
+        
         msp = doc.modelspace()
         
         # Count entities
@@ -8,18 +8,18 @@ Single-page design with:
 
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import gzip
+import io
+import hashlib
+import orjson
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-from typing import Dict, Any
-import matplotlib.pyplot as plt
-from shapely.geometry import shape, Polygon
+from typing import Dict, Any, Optional
 import numpy as np
-from plotly.subplots import make_subplots
-import pandas as pd
-from typing import Dict, Any
 import os
+import re
+import time
+from collections import defaultdict
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -29,6 +29,1092 @@ load_dotenv()
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
 
+@st.cache_data
+def compact_markup(markup: str) -> str:
+    """Static HTML/CSS without comments and indentation.
+    
+    The page CSS and header are sent to the browser again on every rerun;
+    the compacted copy is built once and reused.
+    """
+    markup = re.sub(r'/\*.*?\*/', '', markup, flags=re.S)
+    markup = re.sub(r'\s+', ' ', markup)
+    return re.sub(r'\s*([{};])\s*', r'\1', markup).strip()
+
+
+def read_optimization_stream(response: requests.Response) -> Dict[str, Any]:
+    """Rebuild the /api/optimize result from its GeoJSON text sequence.
+    
+    The first record holds the result without features; each following
+    record is a Feature tagged with the indices of the stages it belongs to.
+    """
+    result = None
+    for line in response.iter_lines():
+        record = line.lstrip(b"\x1e")
+        if not record:
+            continue
+        item = orjson.loads(record)
+        if result is None:
+            result = item
+            continue
+        for index in item.pop("stages"):
+            result["stages"][index]["geometry"]["features"].append(item)
+    
+    final_stage = result.pop("final_layout_stage", None)
+    result["final_layout"] = result["stages"][final_stage]["geometry"] if final_stage is not None else None
+    return result
+
+
+@st.cache_resource
+def api_session() -> requests.Session:
+    """Keep-alive connections to the API, shared across script reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def post_json(path: str, payload: Any, **kwargs) -> requests.Response:
+    """POST a JSON body to the API, encoded with orjson rather than requests' stdlib json."""
+    return api_session().post(
+        f"{API_URL}{path}",
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        **kwargs
+    )
+
+
+# Longest a submitted optimization is waited for (10 minutes)
+OPTIMIZATION_TIMEOUT = 600
+
+
+def submit_optimization(payload: Dict[str, Any]) -> str:
+    """POST the pipeline request to /api/jobs, which answers at once with a job id.
+    
+    Raises:
+        RuntimeError: If the API answers with an error status
+    """
+    response = post_json("/api/jobs", payload, timeout=30)
+    if response.status_code != 202:
+        raise RuntimeError(f"API Error: {response.text[:200]}")
+    return orjson.loads(response.content)['job_id']
+
+
+def poll_optimization(job_id: str) -> Optional[Dict[str, Any]]:
+    """Check a submitted job; fetch and rebuild its result once complete.
+    
+    Returns:
+        The result, or None while the job is still pending or running
+    
+    Raises:
+        RuntimeError: If the job failed or the API answers with an error status
+    """
+    response = api_session().get(f"{API_URL}/api/status/{job_id}", timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"API Error: {response.text[:200]}")
+    job = orjson.loads(response.content)
+    if job['status'] == 'failed':
+        raise RuntimeError(job['error'])
+    if job['status'] != 'complete':
+        return None
+    
+    response = api_session().get(f"{API_URL}/api/result/{job['result_id']}", timeout=60, stream=True)
+    with response:
+        if response.status_code != 200:
+            raise RuntimeError(f"API Error: {response.text[:200]}")
+        return read_optimization_stream(response)
+
+
+def read_download(response: requests.Response) -> io.BytesIO:
+    """Copy a streamed (stream=True) response body into a buffer chunk by chunk."""
+    buffer = io.BytesIO()
+    with response:
+        for chunk in response.iter_content(chunk_size=65536):
+            buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+
+def polygon_trace_xy(features: list) -> tuple:
+    """Concatenate polygon exterior rings into one trace's x/y arrays and text.
+    
+    Rings are separated by NaN (sent to Plotly as null) so a single Scattergl
+    trace draws them all.
+    """
+    if not features:
+        return np.empty(0), np.empty(0), []
+    gap = np.full((1, 2), np.nan)
+    parts, text = [], []
+    for feature in features:
+        ring = np.asarray(feature['geometry']['coordinates'][0], dtype=float)[:, :2]
+        label = feature['properties'].get('type', 'lot').title()
+        parts.extend((ring, gap))
+        text.extend([label] * len(ring) + [None])
+    xy = np.concatenate(parts)
+    return xy[:, 0], xy[:, 1], text
+
+
+def hatch_lines_xy(polygons: np.ndarray, spacing: float = 15, angle: float = 45) -> tuple:
+    """Parallel hatching clipped to each polygon, as one NaN-separated x/y pair.
+    
+    Lines for all polygons are laid out with numpy and clipped in a single
+    vectorized Shapely intersection; each clipped piece is drawn from its
+    first to its last point.
+    
+    Args:
+        polygons: Array of Shapely polygons
+        spacing: Distance between hatch lines (m)
+        angle: Hatch direction (degrees)
+    
+    Returns:
+        (xs, ys) arrays for a single line trace
+    """
+    import shapely
+    
+    minx, miny, maxx, maxy = shapely.bounds(polygons).T
+    diag = np.hypot(maxx - minx, maxy - miny)
+    
+    # Offsets per polygon across its diagonal, centred on its bounding box
+    offsets = [np.arange(-int(d / 2), int(d / 2), spacing) for d in diag]
+    owner = np.repeat(np.arange(len(polygons)), [len(o) for o in offsets])
+    if len(owner) == 0:
+        return np.empty(0), np.empty(0)
+    offset = np.concatenate(offsets).astype(float)
+    
+    rad = np.radians(angle)
+    cos_a, sin_a = np.cos(rad), np.sin(rad)
+    cx = (minx + maxx)[owner] / 2 + offset * cos_a
+    cy = (miny + maxy)[owner] / 2 + offset * sin_a
+    d = diag[owner]
+    starts = np.column_stack([cx - d * sin_a, cy + d * cos_a])
+    ends = np.column_stack([cx + d * sin_a, cy - d * cos_a])
+    lines = shapely.linestrings(np.stack([starts, ends], axis=1))
+    
+    clipped = shapely.intersection(lines, polygons[owner])
+    kind = shapely.get_type_id(clipped)
+    clipped = clipped[((kind == 1) | (kind == 5)) & ~shapely.is_empty(clipped)]  # (Multi)LineString
+    coords, index = shapely.get_coordinates(shapely.get_parts(clipped), return_index=True)
+    
+    counts = np.bincount(index)
+    first = np.cumsum(counts) - counts
+    last = first + counts - 1
+    keep = counts >= 2
+    first, last = first[keep], last[keep]
+    gap = np.full(len(first), np.nan)
+    xs = np.column_stack([coords[first, 0], coords[last, 0], gap]).ravel()
+    ys = np.column_stack([coords[first, 1], coords[last, 1], gap]).ravel()
+    return xs, ys
+
+
+def feature_geometries(features: list) -> np.ndarray:
+    """Parse the geometries of GeoJSON features into one array of Shapely geometries."""
+    import shapely
+    
+    return shapely.from_geojson([orjson.dumps(f['geometry']) for f in features])
+
+
+def parts_xy(geometries: np.ndarray) -> tuple:
+    """Coordinates of every part of the geometries as one NaN-separated x/y pair.
+    
+    Polygons contribute their exterior rings; lines and points their own
+    coordinates. All parts are extracted in a single vectorized call.
+    
+    Args:
+        geometries: Array of Shapely geometries
+    
+    Returns:
+        (xs, ys) arrays for a single trace
+    """
+    import shapely
+    
+    parts = shapely.get_parts(geometries)
+    is_polygon = shapely.get_type_id(parts) == 3
+    parts[is_polygon] = shapely.get_exterior_ring(parts[is_polygon])
+    coords, index = shapely.get_coordinates(parts, return_index=True)
+    
+    # A NaN row after each part's last coordinate
+    ends = np.cumsum(np.bincount(index, minlength=len(parts)))
+    xy = np.insert(coords, ends, np.nan, axis=0)
+    return xy[:, 0], xy[:, 1]
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Stable identity of a result (or land plot), used to cache the figures drawn from it."""
+    if result.get('result_id'):
+        return result['result_id']
+    return hashlib.blake2b(orjson.dumps(result, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def cached_figure(name: str, key: str, build):
+    """Return the figure stored under name for key, building it on a miss.
+    
+    Streamlit reruns the whole script on every widget change; figures (and
+    download payloads) of an unchanged result are reused from session state
+    instead of rebuilt.
+    """
+    cache = st.session_state.setdefault('figure_cache', {})
+    entry = cache.get(name)
+    if entry is None or entry[0] != key:
+        figure = build()
+        if figure is None:  # Failed plots are retried on the next rerun
+            return None
+        entry = cache[name] = (key, figure)
+    return entry[1]
+
+
+# Downloads are gzipped; low levels already shrink JSON several times over
+DOWNLOAD_COMPRESSLEVEL = 3
+
+
+def gzip_json(obj: Any) -> bytes:
+    """Indented JSON of obj, gzip-compressed for a download button."""
+    return gzip.compress(orjson.dumps(obj, option=orjson.OPT_INDENT_2), compresslevel=DOWNLOAD_COMPRESSLEVEL)
+
+
+# GeoJSON uploads larger than this are streamed up to their first geometry
+# instead of parsed whole
+GEOJSON_STREAM_MIN_BYTES = 5 * 1024 * 1024
+
+
+def read_land_geometry(uploaded: io.BytesIO) -> Dict[str, Any]:
+    """Land plot from an uploaded GeoJSON geometry or FeatureCollection.
+    
+    Only the first feature of a FeatureCollection is used; for large files it
+    is read incrementally with ijson, without building the rest of the tree.
+    """
+    if uploaded.size > GEOJSON_STREAM_MIN_BYTES:
+        import ijson
+        
+        uploaded.seek(0)
+        geometry = next(ijson.items(uploaded, 'features.item.geometry', use_float=True), None)
+        if geometry is not None:
+            return geometry
+    
+    data = orjson.loads(uploaded.getvalue())
+    if data['type'] == 'FeatureCollection':
+        return data['features'][0]['geometry']
+    return data
+
+
+def parse_manual_coords(text: str) -> Dict[str, Any]:
+    """Build the land plot for a JSON list of [x, y] points.
+    
+    Raises:
+        ValueError: If the text is not JSON or not a list of at least three points
+    """
+    coords = orjson.loads(text)
+    try:
+        points = np.asarray(coords, dtype=float)
+    except TypeError:  # Objects among the points
+        points = np.empty(0)
+    if points.ndim != 2 or points.shape[1] != 2 or len(points) < 3 or not np.isfinite(points).all():
+        raise ValueError("expected a list of at least three [x, y] points")
+    return {
+        "type": "Polygon",
+        "coordinates": [coords],
+        "properties": {}
+    }
+
+
+def land_source_changed(source: tuple) -> bool:
+    """Record which input the land plot comes from; True if it changed.
+    
+    Reruns with the same sample, file or text keep the existing land_plot
+    instead of rebuilding it (or re-uploading a DXF to the API).
+    """
+    if st.session_state.get('land_source') == source:
+        return False
+    st.session_state.land_source = source
+    st.session_state.land_plot_batch = []  # Only a multi-file upload sets a batch
+    return True
+
+
+def input_land_plots() -> list:
+    """Land plots to optimize: a multi-file upload's batch, else the single land plot.
+    
+    All plots go in one request; the pipeline treats them as one site.
+    """
+    return st.session_state.land_plot_batch or [st.session_state.land_plot]
+
+
+def layout_features(result: Dict[str, Any]) -> list:
+    """Features of the full layout: the base stage beneath final_layout."""
+    features = list((result.get('final_layout') or {}).get('features', []))
+    base_index = result.get('base_stage_index')
+    if base_index is not None:
+        features = result['stages'][base_index]['geometry']['features'] + features
+    return features
+
+
+# Display copy of the layout: outlines simplified within this tolerance and
+# coordinates rounded to millimetres, both far below what 1/500 can show
+DISPLAY_TOLERANCE = 0.05
+DISPLAY_DECIMALS = 3
+
+
+def display_features(features: list) -> list:
+    """Simplified, rounded copies of layout features for plotting and download.
+    
+    All geometries go through Shapely in one vectorized batch; properties are
+    kept as they are.
+    """
+    import shapely
+    
+    if not features:
+        return []
+    geoms = shapely.from_geojson([orjson.dumps(f['geometry']) for f in features])
+    geoms = shapely.simplify(geoms, DISPLAY_TOLERANCE, preserve_topology=True)
+    geoms = shapely.transform(geoms, lambda coords: np.round(coords, DISPLAY_DECIMALS))
+    return [
+        {**f, 'geometry': orjson.loads(geometry)}
+        for f, geometry in zip(features, shapely.to_geojson(geoms))
+    ]
+
+
+def plot_input_preview(land_plots: list) -> go.Figure:
+    """Outlines of the input land plots shown before any optimization (one trace)."""
+    gap = np.full((1, 2), np.nan)
+    rings = [np.asarray(plot['coordinates'][0], dtype=float)[:, :2] for plot in land_plots]
+    coords = np.concatenate([part for ring in rings for part in (ring, gap)])
+    xs, ys = coords[:, 0], coords[:, 1]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=xs, y=ys,
+        fill='toself',
+        fillcolor='rgba(100, 126, 234, 0.2)',
+        line=dict(color='#667eea', width=2),
+        name='Input Land'
+    ))
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        title="Input Land Plot",
+        showlegend=False
+    )
+    fig.update_yaxes(scaleanchor="x", scaleratio=1)
+    return fig
+
+
+def plot_stage_comparison(stages: list) -> go.Figure:
+    """Side-by-side Stage 1 blocks and Stage 2 subdivision figure."""
+    from plotly.subplots import make_subplots
+    
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Stage 1: Grid Optimization', 'Stage 2: Subdivision'),
+        horizontal_spacing=0.05
+    )
+    
+    # Stage 1: Grid blocks (one WebGL trace, rings separated by gaps)
+    xs, ys, _ = polygon_trace_xy(stages[0]['geometry']['features'])
+    fig.add_trace(go.Scattergl(
+        x=xs, y=ys,
+        fill='toself',
+        fillcolor='rgba(100, 126, 234, 0.5)',
+        line=dict(color='#667eea', width=1),
+        showlegend=False,
+        hoverinfo='skip'
+    ), row=1, col=1)
+    
+    # Stage 2: Lots, then parks/setbacks/service on top
+    stage2_features = stages[1]['geometry']['features']
+    lot_features = [f for f in stage2_features if f['properties'].get('type', 'lot') == 'lot']
+    other_features = [f for f in stage2_features if f['properties'].get('type', 'lot') != 'lot']
+    
+    for features, color, line_color in (
+        (lot_features, 'rgba(255, 152, 0, 0.7)', '#ff9800'),
+        (other_features, 'rgba(76, 175, 80, 0.7)', '#4caf50'),
+    ):
+        if not features:
+            continue
+        xs, ys, text = polygon_trace_xy(features)
+        fig.add_trace(go.Scattergl(
+            x=xs, y=ys,
+            fill='toself',
+            fillcolor=color,
+            line=dict(color=line_color, width=1),
+            showlegend=False,
+            hoverinfo='text',
+            text=text
+        ), row=1, col=2)
+    
+    fig.update_layout(
+        height=450,
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=False
+    )
+    fig.update_xaxes(scaleanchor="y", scaleratio=1)
+    fig.update_yaxes(scaleanchor="x", scaleratio=1)
+    
+    return fig
+
+
+def plot_master_plan_plotly(features: list) -> Optional[go.Figure]:
+    """
+    CAD-Style Master Plan Visualization.
+    Professional engineering drawing with:
+    - Hatching patterns on lots (like AutoCAD)
+    - Tree symbols in parks
+    - Road centerlines and edges
+    - Building-style thick borders
+    - Engineering grid background
+    """
+    import shapely
+    
+    try:
+        # All traces are WebGL (Scattergl): mixed with SVG traces they would
+        # draw on top regardless of order. Filled areas show their hover
+        # text at the outline vertices (WebGL has no fill hover).
+        fig = go.Figure()
+        
+        # Bucket features by type in one pass; each layer walks its own bucket
+        buckets = defaultdict(list)
+        for f in features:
+            buckets[f['properties'].get('type')].append(f)
+        
+        # Collect bounds for auto-fit (coordinate arrays, NaN gaps included)
+        all_x, all_y = [], []
+        
+        # --- HELPER FUNCTIONS ---
+        def layer_xy(geometries):
+            """NaN-separated trace coordinates of a layer, added to the plot bounds."""
+            xs, ys = parts_xy(geometries)
+            all_x.append(xs)
+            all_y.append(ys)
+            return xs, ys
+        
+        def generate_trees_in_polygons(polygons, counts):
+            """Generate tree positions within polygons.
+            
+            Each polygon gets a jittered grid over its bounding box, sized
+            so about `counts` cells fall inside; the first `counts` inside
+            (in a shuffled order, so they spread over the polygon) are kept.
+            The jitter is seeded from the polygon's geometry, so a layout
+            always gets the same trees. All candidates are tested in one
+            vectorized contains_xy call. Returns (x, y, i) arrays, i being
+            each tree's index within its polygon.
+            """
+            cand_x, cand_y = [], []
+            for polygon, count in zip(polygons, counts):
+                minx, miny, maxx, maxy = polygon.bounds
+                fill = polygon.area / max((maxx - minx) * (maxy - miny), 1e-9)
+                n = int(np.ceil(np.sqrt(count / max(fill, 0.1))))
+                seed = hashlib.blake2b(shapely.to_wkb(polygon), digest_size=8).digest()
+                rng = np.random.default_rng(int.from_bytes(seed, 'little'))
+                
+                # Cell centres jittered by up to 0.3 cell, in unit coordinates
+                centres = (np.arange(n) + 0.5) / n
+                gx, gy = (c.ravel() for c in np.meshgrid(centres, centres))
+                order = rng.permutation(n * n)
+                jx, jy = rng.uniform(-0.3, 0.3, (2, n * n)) / n
+                cand_x.append(minx + (gx[order] + jx) * (maxx - minx))
+                cand_y.append(miny + (gy[order] + jy) * (maxy - miny))
+            
+            if not cand_x:
+                return np.empty(0), np.empty(0), np.empty(0, dtype=int)
+            sizes = [len(c) for c in cand_x]
+            owner = np.repeat(np.arange(len(sizes)), sizes)
+            px, py = np.concatenate(cand_x), np.concatenate(cand_y)
+            inside = shapely.contains_xy(polygons[owner], px, py)
+            
+            # Index of each hit among its polygon's hits
+            hits = np.cumsum(inside)
+            before = np.concatenate([[0], hits[np.cumsum(sizes)[:-1] - 1]])
+            index = hits - before[owner] - 1
+            keep = inside & (index < counts[owner])
+            return px[keep], py[keep], index[keep]
+        
+        # --- CAD COLOR PALETTE ---
+        CAD_COLORS = {
+            'lot_fill': 'rgba(255, 248, 220, 0.6)',      # Cream/Beige
+            'lot_hatch': '#cd853f',                       # Peru/Brown
+            'lot_border': '#8b4513',                      # Saddle Brown
+            'park_fill': 'rgba(144, 238, 144, 0.4)',     # Light Green
+            'park_border': '#228b22',                     # Forest Green
+            'tree': '#228b22',                            # Forest Green
+            'tree_outline': '#006400',                    # Dark Green
+            'xlnt_fill': 'rgba(0, 206, 209, 0.4)',       # Cyan
+            'xlnt_border': '#008b8b',                     # Dark Cyan
+            'service_fill': 'rgba(221, 160, 221, 0.5)',  # Plum
+            'service_border': '#8b008b',                  # Dark Magenta
+            'electric': '#0000cd',                        # Medium Blue
+            'transformer': '#ff0000',                     # Red
+            'drainage': '#00ced1',                        # Dark Turquoise
+            'road_center': '#8b0000',                     # Dark Red
+            'road_edge': '#2f4f4f',                       # Dark Slate Gray
+        }
+
+        # === LAYER 0: ROAD NETWORK (Background) ===
+        # Draw road areas as white/beige with edge lines (one trace for all roads)
+        # Each layer's geometries are parsed in one batch; coordinates,
+        # areas and centroids come from vectorized Shapely calls
+        road_geoms = feature_geometries(buckets['road_network'])
+        # Only reasonably sized roads (not the huge bounding box), < 100,000 m²
+        road_geoms = road_geoms[shapely.area(road_geoms) < 100000]
+        road_x, road_y = parts_xy(road_geoms)
+        
+        # Centerlines through each polygon's centroid, along its longer side
+        road_polys = road_geoms[shapely.get_type_id(road_geoms) == 3]
+        minx, miny, maxx, maxy = shapely.bounds(road_polys).T
+        cx, cy = shapely.get_coordinates(shapely.centroid(road_polys)).T
+        horizontal = (maxx - minx) > (maxy - miny)
+        gap = np.full(len(road_polys), np.nan)
+        road_centerlines_x = np.column_stack([
+            np.where(horizontal, minx, cx), np.where(horizontal, maxx, cx), gap
+        ]).ravel()
+        road_centerlines_y = np.column_stack([
+            np.where(horizontal, cy, miny), np.where(horizontal, cy, maxy), gap
+        ]).ravel()
+        
+        if len(road_x):
+            fig.add_trace(go.Scattergl(
+                x=road_x, y=road_y,
+                fill='toself',
+                fillcolor='rgba(245, 245, 220, 0.8)',  # Beige
+                line=dict(color=CAD_COLORS['road_edge'], width=2),
+                name='🛣️ Đường Giao Thông',
+                legendgroup='roads',
+                hoverinfo='text',
+                text='Road Network'
+            ))
+        
+        # Draw all road centerlines
+        if len(road_centerlines_x):
+            fig.add_trace(go.Scattergl(
+                x=road_centerlines_x, y=road_centerlines_y,
+                mode='lines',
+                line=dict(color=CAD_COLORS['road_center'], width=2, dash='dash'),
+                name='Road Centerline',
+                legendgroup='roads',
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+
+        # === LAYER 1: LOTS WITH DOUBLE-LINE BORDERS (CAD STYLE) ===
+        # Each style is one trace over all lots (rings separated by None)
+        hatch_x, hatch_y = [], []
+        label_x, label_y, label_text = [], [], []
+        
+        # Lot geometries in one batch: outlines, centroids (labels, boundary trees) and hatching
+        lot_geoms = feature_geometries(buckets['lot'])
+        lot_x, lot_y = layer_xy(lot_geoms)
+        lot_centres = shapely.get_coordinates(shapely.centroid(lot_geoms))
+        
+        for f, (cx, cy) in zip(buckets['lot'], lot_centres):
+            props = f['properties']
+            area = props.get('area', 0)
+            lot_id = props.get('id', 'N/A')
+            
+            # Add lot ID label in center
+            fig.add_annotation(
+                x=cx, y=cy,
+                text=f"<b>L{lot_id}</b>",
+                font=dict(size=9, color='#5d4037', family='Arial'),
+                showarrow=False,
+                bgcolor='rgba(255,255,255,0.7)',
+                borderpad=2
+            )
+            label_x.append(cx)
+            label_y.append(cy)
+            label_text.append(f"<b>🏭 Lô {lot_id}</b><br>Diện tích: {area:.0f} m²")
+        
+        # Add hatching lines (increased spacing for less density)
+        try:
+            hatch_x, hatch_y = hatch_lines_xy(lot_geoms, spacing=30, angle=45)
+        except Exception:
+            pass  # Skip hatching if it fails
+        
+        if len(lot_x):
+            # OUTER BORDER (thick dark - like building wall)
+            fig.add_trace(go.Scattergl(
+                x=lot_x, y=lot_y,
+                fill=None,
+                mode='lines',
+                line=dict(color='#5d4037', width=5),  # Dark brown outer
+                legendgroup='lots',
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            
+            # FILL with inner border
+            fig.add_trace(go.Scattergl(
+                x=lot_x, y=lot_y,
+                fill='toself',
+                fillcolor=CAD_COLORS['lot_fill'],
+                line=dict(color=CAD_COLORS['lot_border'], width=2),
+                name='🏭 Lô Đất',
+                legendgroup='lots',
+                hoverinfo='skip'
+            ))
+        
+        if len(hatch_x):
+            fig.add_trace(go.Scattergl(
+                x=hatch_x, y=hatch_y,
+                mode='lines',
+                line=dict(color=CAD_COLORS['lot_hatch'], width=0.8),
+                name='Hatching',
+                legendgroup='lots',
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+        
+        if label_x:
+            # Per-lot hover info, anchored on the (invisible) lot centres
+            fig.add_trace(go.Scattergl(
+                x=label_x, y=label_y,
+                mode='markers',
+                marker=dict(size=24, opacity=0),
+                text=label_text,
+                hovertemplate="%{text}<br><extra></extra>",
+                legendgroup='lots',
+                showlegend=False
+            ))
+
+        # === LAYER 2: PARKS WITH TREES ===
+        park_geoms = feature_geometries(buckets['park'])
+        park_x, park_y = layer_xy(park_geoms)
+        
+        # Trees in parks, alternating star (main), circle and palm/shrub
+        tree_counts = np.clip((shapely.area(park_geoms) / 300).astype(int), 5, 25)
+        tree_x, tree_y, tree_i = generate_trees_in_polygons(park_geoms, tree_counts)
+        all_star_trees_x = tree_x[tree_i % 3 == 0].tolist()
+        all_star_trees_y = tree_y[tree_i % 3 == 0].tolist()
+        all_circle_trees_x = tree_x[tree_i % 3 == 1].tolist()
+        all_circle_trees_y = tree_y[tree_i % 3 == 1].tolist()
+        all_palm_x = tree_x[tree_i % 3 == 2].tolist()
+        all_palm_y = tree_y[tree_i % 3 == 2].tolist()
+        
+        if len(park_x):
+            # OUTER BORDER for parks (dark green)
+            fig.add_trace(go.Scattergl(
+                x=park_x, y=park_y,
+                fill=None,
+                mode='lines',
+                line=dict(color='#1b5e20', width=4),  # Dark green outer
+                legendgroup='parks',
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            
+            # Draw park fill with inner border
+            fig.add_trace(go.Scattergl(
+                x=park_x, y=park_y,
+                fill='toself',
+                fillcolor=CAD_COLORS['park_fill'],
+                line=dict(color=CAD_COLORS['park_border'], width=2),
+                name='🌳 Cây Xanh',
+                legendgroup='parks',
+                hoverinfo='text',
+                text='🌳 Park / Green Space'
+            ))
+    
+        # Also add trees along lot boundaries (like CAD drawing)
+        for f, (cx, cy) in zip(buckets['lot'], lot_centres):
+            if f['geometry']['type'] == 'Polygon':
+                # Add trees at polygon vertices/corners
+                coords = f['geometry']['coordinates'][0]
+                step = max(1, len(coords) // 4)  # ~4 trees per lot boundary
+                for i in range(0, len(coords), step):
+                    px, py = coords[i]
+                    # Offset slightly into the lot
+                    offset_x = (cx - px) * 0.05
+                    offset_y = (cy - py) * 0.05
+                    all_circle_trees_x.append(px + offset_x)
+                    all_circle_trees_y.append(py + offset_y)
+        
+        # Draw star-shaped trees (CAD style - like asterisks)
+        if all_star_trees_x:
+            fig.add_trace(go.Scattergl(
+                x=all_star_trees_x, y=all_star_trees_y,
+                mode='markers',
+                marker=dict(
+                    symbol='asterisk',
+                    size=14,
+                    color='#2e8b57',  # Sea green
+                    line=dict(width=2, color='#006400'),
+                ),
+                name='🌲 Cây Lớn',
+                legendgroup='trees',
+                hoverinfo='text',
+                text='🌲 Large Tree'
+            ))
+        
+        # Draw circle trees
+        if all_circle_trees_x:
+            fig.add_trace(go.Scattergl(
+                x=all_circle_trees_x, y=all_circle_trees_y,
+                mode='markers',
+                marker=dict(
+                    symbol='circle',
+                    size=10,
+                    color='#32cd32',  # Lime green
+                    line=dict(width=1.5, color='#228b22'),
+                    opacity=0.85
+                ),
+                name='🌳 Cây Trung',
+                legendgroup='trees',
+                showlegend=False,
+                hoverinfo='text',
+                text='🌳 Medium Tree'
+            ))
+        
+        # Draw palm/shrub markers
+        if all_palm_x:
+            fig.add_trace(go.Scattergl(
+                x=all_palm_x, y=all_palm_y,
+                mode='markers',
+                marker=dict(
+                    symbol='hexagram',
+                    size=8,
+                    color='#90ee90',  # Light green
+                    line=dict(width=1, color='#228b22'),
+                    opacity=0.8
+                ),
+                name='🌴 Cây Nhỏ',
+                legendgroup='trees',
+                showlegend=False,
+                hoverinfo='text',
+                text='🌴 Small Plant'
+            ))
+
+        # === LAYER 3: SERVICE & TECHNICAL AREAS ===
+        # Service before XLNT, the order the pipeline emits them
+        for ftype, fill_key, border_key, name, label in (
+            ('service', 'service_fill', 'service_border', '🏢 Điều Hành', '🏢 Service / Admin'),
+            ('xlnt', 'xlnt_fill', 'xlnt_border', '💧 XLNT', '💧 Xử Lý Nước Thải'),
+        ):
+            area_x, area_y = layer_xy(feature_geometries(buckets[ftype]))
+            if len(area_x):
+                fig.add_trace(go.Scattergl(
+                    x=area_x, y=area_y,
+                    fill='toself',
+                    fillcolor=CAD_COLORS[fill_key],
+                    line=dict(color=CAD_COLORS[border_key], width=2.5),
+                    name=name,
+                    legendgroup=ftype,
+                    hoverinfo='text',
+                    text=label
+                ))
+
+        # === LAYER 4: ELECTRIC NETWORK ===
+        cable_x, cable_y = layer_xy(feature_geometries(buckets['connection']))
+        
+        if len(cable_x):
+            # Draw as dashed lines
+            fig.add_trace(go.Scattergl(
+                x=cable_x, y=cable_y,
+                mode='lines',
+                line=dict(color=CAD_COLORS['electric'], width=2, dash='dashdot'),
+                name='⚡ Điện Ngầm',
+                legendgroup='electric',
+                hoverinfo='text',
+                text='⚡ Underground Cable'
+            ))
+
+        # === LAYER 5: TRANSFORMERS ===
+        t_x, t_y = shapely.get_coordinates(feature_geometries(buckets['transformer'])).T
+        all_x.append(t_x)
+        all_y.append(t_y)
+        
+        if len(t_x):
+            fig.add_trace(go.Scattergl(
+                x=t_x, y=t_y,
+                mode='markers+text',
+                marker=dict(
+                    symbol='square',
+                    size=14,
+                    color=CAD_COLORS['transformer'],
+                    line=dict(width=2, color='white')
+                ),
+                text=['T'] * len(t_x),
+                textposition='middle center',
+                textfont=dict(size=8, color='white', family='Arial Black'),
+                name='🔴 Trạm Biến Áp',
+                legendgroup='transformer',
+                hoverinfo='text',
+                hovertext='🔴 Transformer Station'
+            ))
+
+        # === LAYER 6: DRAINAGE ===
+        drain_features = buckets['drainage']
+        if len(drain_features) > 25:
+            drain_features = drain_features[::2]
+        
+        # All arrows in one trace: start/end/gap per segment, with an
+        # arrowhead marker (pointing away from the start) only at the end
+        segments = [
+            (f['geometry']['coordinates'][0][:2], f['geometry']['coordinates'][-1][:2])
+            for f in drain_features
+            if f['geometry']['type'] == 'LineString' and len(f['geometry']['coordinates']) >= 2
+        ]
+        ends = np.array(segments, dtype=float).reshape(-1, 2, 2)
+        gaps = np.full((len(ends), 1), np.nan)
+        # Marker angles are clockwise from north
+        delta = ends[:, 1] - ends[:, 0]
+        heading = 90 - np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+        fig.add_trace(go.Scattergl(
+            x=np.hstack([ends[:, :, 0], gaps]).ravel(),
+            y=np.hstack([ends[:, :, 1], gaps]).ravel(),
+            mode='lines+markers',
+            marker=dict(
+                symbol='arrow',
+                angle=np.column_stack([np.zeros(len(ends)), heading, np.zeros(len(ends))]).ravel(),
+                color=CAD_COLORS['drainage'],
+                size=np.tile([0, 12, 0], len(ends))
+            ),
+            line=dict(color=CAD_COLORS['drainage'], width=2),
+            name='💧 Thoát Nước',
+            legendgroup='drainage',
+            hoverinfo='skip'
+        ))
+
+        # === AUTO-FIT BOUNDS ===
+        fit_x, fit_y = np.concatenate(all_x), np.concatenate(all_y)
+        if np.any(~np.isnan(fit_x)):
+            x_min, x_max = np.nanmin(fit_x), np.nanmax(fit_x)
+            y_min, y_max = np.nanmin(fit_y), np.nanmax(fit_y)
+            x_pad = (x_max - x_min) * 0.08
+            y_pad = (y_max - y_min) * 0.08
+            x_range = [x_min - x_pad, x_max + x_pad]
+            y_range = [y_min - y_pad, y_max + y_pad]
+        else:
+            x_range = None
+            y_range = None
+
+        # === CAD-STYLE LAYOUT ===
+        fig.update_layout(
+            title=dict(
+                text="<b>📐 QUY HOẠCH CHI TIẾT 1/500</b>",
+                y=0.98,
+                x=0.5,
+                xanchor='center',
+                yanchor='top',
+                font=dict(size=18, color='#1a1a1a', family='Arial Black')
+            ),
+            height=1000,  # Taller for more space
+            xaxis=dict(
+                showgrid=True,
+                gridcolor='rgba(200, 200, 200, 0.3)',
+                gridwidth=1,
+                zeroline=False,
+                scaleanchor="y",
+                scaleratio=1,
+                title=dict(text="X (meters)", font=dict(size=11, color='#333')),
+                range=x_range,
+                showspikes=True,
+                spikecolor='#666',
+                spikethickness=1,
+                tickfont=dict(size=10),
+                side='bottom'
+            ),
+            yaxis=dict(
+                showgrid=True,
+                gridcolor='rgba(200, 200, 200, 0.3)',
+                gridwidth=1,
+                zeroline=False,
+                title=dict(text="Y (meters)", font=dict(size=11, color='#333')),
+                range=y_range,
+                showspikes=True,
+                spikecolor='#666',
+                spikethickness=1,
+                tickfont=dict(size=10)
+            ),
+            plot_bgcolor='rgba(255, 255, 252, 1)',  # Warm white like paper
+            paper_bgcolor='white',
+            hovermode='closest',
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.08,  # Below the chart
+                xanchor="center",
+                x=0.5,
+                bgcolor='rgba(255,255,255,0.95)',
+                bordercolor='rgba(0,0,0,0.1)',
+                borderwidth=1,
+                font=dict(size=9, family='Arial'),
+                itemsizing='constant',
+                tracegroupgap=5
+            ),
+            margin=dict(l=60, r=60, t=60, b=100)  # More space at bottom for legend
+        )
+        
+        # === CAD-STYLE ANNOTATIONS ===
+        # North Arrow (top-right corner)
+        fig.add_annotation(
+            x=0.97, y=0.97,
+            xref='paper', yref='paper',
+            text='<b>⬆ N</b>',
+            font=dict(size=16, color='#333', family='Arial Black'),
+            showarrow=False,
+            bgcolor='rgba(255,255,255,0.9)',
+            bordercolor='#333',
+            borderwidth=1,
+            borderpad=4
+        )
+        
+        # Scale Bar (calculate based on data range)
+        if x_range and y_range:
+            plot_width = x_range[1] - x_range[0]
+            # Determine appropriate scale bar length
+            if plot_width > 1000:
+                scale_len = 200
+                scale_text = '200m'
+            elif plot_width > 500:
+                scale_len = 100
+                scale_text = '100m'
+            else:
+                scale_len = 50
+                scale_text = '50m'
+            
+            # Scale bar position (bottom-left)
+            sb_x = x_range[0] + (x_range[1] - x_range[0]) * 0.05
+            sb_y = y_range[0] + (y_range[1] - y_range[0]) * 0.03
+            
+            # Draw scale bar line
+            fig.add_trace(go.Scattergl(
+                x=[sb_x, sb_x + scale_len],
+                y=[sb_y, sb_y],
+                mode='lines',
+                line=dict(color='black', width=3),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            
+            # Scale bar end caps
+            fig.add_trace(go.Scattergl(
+                x=[sb_x, sb_x],
+                y=[sb_y - 5, sb_y + 5],
+                mode='lines',
+                line=dict(color='black', width=2),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scattergl(
+                x=[sb_x + scale_len, sb_x + scale_len],
+                y=[sb_y - 5, sb_y + 5],
+                mode='lines',
+                line=dict(color='black', width=2),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            
+            # Scale bar label
+            fig.add_annotation(
+                x=sb_x + scale_len / 2, y=sb_y + 15,
+                text=f'<b>{scale_text}</b>',
+                font=dict(size=10, color='#333'),
+                showarrow=False,
+                bgcolor='rgba(255,255,255,0.8)'
+            )
+
+        return fig
+
+    except Exception as e:
+        st.error(f"Plotting error: {e}")
+        return None
+
+
+
+@st.cache_resource
+def sample_plots() -> Dict[str, Dict[str, Any]]:
+    """Sample land plots offered in the Input panel (GeoJSON, sent to the API as is).
+    
+    Built once per server process and shared read-only, not rebuilt on reruns.
+    """
+    return {
+        name: {"type": "Polygon", "coordinates": coords, "properties": {"name": name}}
+        for name, coords in {
+            "Rectangle 100x100": [[[0, 0], [100, 0], [100, 100], [0, 100], [0, 0]]],
+            "L-Shape": [[[0, 0], [60, 0], [60, 40], [40, 40], [40, 100], [0, 100], [0, 0]]],
+            "Irregular": [[[0, 0], [80, 10], [100, 50], [90, 100], [20, 90], [0, 0]]],
+            "Large Site": [[
+                [0, 0], [950, 50], [1000, 800], [400, 1100], 
+                [100, 900], [-50, 400], [0, 0]
+            ]],
+        }.items()
+    }
+
+
+# Layouts with more features than this render with deck.gl instead of Plotly
+DECK_MIN_FEATURES = 2000
+
+# deck.gl RGBA colours per feature type, following the master plan palette
+DECK_COLORS = {
+    'road_network': [245, 245, 220, 200],
+    'block': [100, 126, 234, 128],
+    'lot': [255, 248, 220, 153],
+    'setback': [205, 133, 63, 60],
+    'park': [144, 238, 144, 102],
+    'service': [221, 160, 221, 128],
+    'xlnt': [0, 206, 209, 102],
+    'connection': [0, 0, 205, 255],
+    'drainage': [0, 206, 209, 255],
+    'transformer': [255, 0, 0, 255],
+}
+
+# Metres per pixel at zoom 0 on the equator (512 px world)
+METRES_PER_PIXEL_Z0 = 78271.52
+
+
+def layout_deck(features: list) -> "pdk.Deck":
+    """
+    Build a deck.gl view of a layout for large feature counts.
+    
+    All polygons, lines and points go into one layer each, so the browser
+    gets flat coordinate arrays rather than a Plotly trace per feature.
+    Layout coordinates are metres; they are drawn as offsets from lng/lat
+    0,0 (open sea) so the basemap underneath stays blank.
+    """
+    import pydeck as pdk
+    
+    polygons, paths, points = [], [], []
+    for feature in features:
+        geom = feature['geometry']
+        ftype = feature['properties'].get('type', 'lot')
+        row = {'type': ftype, 'color': DECK_COLORS.get(ftype, DECK_COLORS['lot'])}
+        if geom['type'] == 'Polygon':
+            polygons.append({**row, 'polygon': geom['coordinates']})
+        elif geom['type'] == 'MultiPolygon':
+            polygons.extend({**row, 'polygon': rings} for rings in geom['coordinates'])
+        elif geom['type'] == 'LineString':
+            paths.append({**row, 'path': geom['coordinates']})
+        elif geom['type'] == 'Point':
+            points.append({**row, 'position': geom['coordinates']})
+    
+    # Fit the view to the outer rings
+    outer = [np.asarray(p['polygon'][0]) for p in polygons if p['polygon']]
+    coords = np.concatenate(outer) if outer else np.zeros((1, 2))
+    (minx, miny), (maxx, maxy) = coords.min(axis=0), coords.max(axis=0)
+    extent = max(maxx - minx, maxy - miny, 1.0)
+    view_state = pdk.ViewState(
+        longitude=(minx + maxx) / 2 / 111319.49,
+        latitude=(miny + maxy) / 2 / 110574.0,
+        zoom=float(np.log2(METRES_PER_PIXEL_Z0 * 500 / extent)),
+    )
+    
+    # deck.gl COORDINATE_SYSTEM.METER_OFFSETS
+    placement = dict(coordinate_system=2, coordinate_origin=[0, 0])
+    layers = [
+        pdk.Layer(
+            'PolygonLayer', data=polygons, get_polygon='polygon',
+            get_fill_color='color', get_line_color=[60, 60, 60, 200],
+            line_width_min_pixels=1, pickable=True, **placement
+        ),
+        pdk.Layer(
+            'PathLayer', data=paths, get_path='path', get_color='color',
+            width_min_pixels=1, pickable=True, **placement
+        ),
+        pdk.Layer(
+            'ScatterplotLayer', data=points, get_position='position',
+            get_fill_color='color', get_radius=4, radius_min_pixels=3,
+            pickable=True, **placement
+        ),
+    ]
+    return pdk.Deck(layers=layers, initial_view_state=view_state, tooltip={'text': '{type}'})
+
+
 # Page config - Wide layout for one-page design
 st.set_page_config(
     page_title="Land Redistribution Optimizer",
@@ -38,7 +1124,7 @@ st.set_page_config(
 )
 
 # Custom CSS for premium styling
-st.markdown("""
+st.markdown(compact_markup("""
 <style>
     /* ===== CSS CUSTOM PROPERTIES (THEME) ===== */
     :root {
@@ -389,10 +1475,10 @@ st.markdown("""
         background: rgba(0,0,0,0.3) !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # Premium Header with gradient background
-st.markdown("""
+st.markdown(compact_markup("""
 <div style="
     background: linear-gradient(135deg, rgba(102, 126, 234, 0.15) 0%, rgba(118, 75, 162, 0.15) 100%);
     border: 1px solid rgba(255, 255, 255, 0.1);
@@ -447,15 +1533,51 @@ st.markdown("""
         ">v2.0</span>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # Initialize session state
 if 'land_plot' not in st.session_state:
     st.session_state.land_plot = None
+if 'land_plot_batch' not in st.session_state:
+    st.session_state.land_plot_batch = []
 if 'result' not in st.session_state:
     st.session_state.result = None
 if 'status' not in st.session_state:
     st.session_state.status = 'ready'
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
+if 'error' not in st.session_state:
+    st.session_state.error = None
+if 'layout' not in st.session_state:
+    st.session_state.layout = []
+
+# Check on the submitted optimization; collect it once the backend is done
+job_id = st.session_state.job_id
+if job_id is not None:
+    run_config = st.session_state.run_config
+    try:
+        result = poll_optimization(job_id)
+        if result is not None:
+            st.session_state.job_id = None
+            st.session_state.result = result
+            # Plotted and downloaded; the full-precision result stays for the report and DXF
+            st.session_state.layout = display_features(layout_features(result))
+            st.session_state.status = 'complete'
+        elif time.time() - st.session_state.started_at > OPTIMIZATION_TIMEOUT:
+            st.session_state.job_id = None
+            st.session_state.status = 'error'
+            st.session_state.error = (
+                f"⏱️ Optimization timed out after 10 minutes. Try reducing Population "
+                f"({run_config['population_size']}) or Generations ({run_config['generations']})."
+            )
+    except requests.exceptions.ConnectionError:
+        st.session_state.job_id = None
+        st.session_state.status = 'error'
+        st.session_state.error = "Cannot connect to API. Is backend running on port 8000?"
+    except Exception as e:
+        st.session_state.job_id = None
+        st.session_state.status = 'error'
+        st.session_state.error = f"Error: {str(e)}"
 
 # Main layout: 3 columns
 col_config, col_action, col_result = st.columns([1.2, 1, 2])
@@ -599,15 +1721,16 @@ with col_config:
             help="Maximum time for solving each block"
         )
         
-        # Show time estimate
+        # Show time estimate (one element, a warning when it may time out)
         est_time = (population_size * generations) / 50
-        if est_time > 60:
-            st.info(f"⏱️ Estimated time: ~{est_time//60:.0f} minutes")
+        estimate = (
+            f"⏱️ Estimated time: ~{est_time//60:.0f} minutes" if est_time > 60
+            else f"⏱️ Estimated time: ~{est_time:.0f} seconds"
+        )
+        if est_time > OPTIMIZATION_TIMEOUT:
+            st.warning(f"{estimate}  \n⚠️ May timeout (>10 min). Consider reducing parameters.")
         else:
-            st.info(f"⏱️ Estimated time: ~{est_time:.0f} seconds")
-        
-        if est_time > 600:
-            st.warning("⚠️ May timeout (>10 min). Consider reducing parameters.")
+            st.info(estimate)
     
     # Infrastructure Parameters
     with st.expander("🏗️ Infrastructure", expanded=False):
@@ -641,28 +1764,10 @@ with col_action:
     
     if input_method == "Sample":
         # Predefined sample
-        sample_type = st.selectbox(
-            "Sample type:",
-            ["Rectangle 100x100", "L-Shape", "Irregular", "Large Site"]
-        )
+        sample_type = st.selectbox("Sample type:", list(sample_plots()))
         
-        if sample_type == "Rectangle 100x100":
-            coords = [[[0, 0], [100, 0], [100, 100], [0, 100], [0, 0]]]
-        elif sample_type == "L-Shape":
-            coords = [[[0, 0], [60, 0], [60, 40], [40, 40], [40, 100], [0, 100], [0, 0]]]
-        elif sample_type == "Irregular":
-            coords = [[[0, 0], [80, 10], [100, 50], [90, 100], [20, 90], [0, 0]]]
-        else:  # Large Site
-            coords = [[
-                [0, 0], [950, 50], [1000, 800], [400, 1100], 
-                [100, 900], [-50, 400], [0, 0]
-            ]]
-        
-        st.session_state.land_plot = {
-            "type": "Polygon",
-            "coordinates": coords,
-            "properties": {"name": sample_type}
-        }
+        if land_source_changed(('sample', sample_type)):
+            st.session_state.land_plot = sample_plots()[sample_type]
     
     elif input_method == "DXF Upload":
         st.info("📐 Upload DXF file containing site boundary (closed polyline)")
@@ -673,39 +1778,54 @@ with col_action:
             help="File should contain closed LWPOLYLINE or POLYLINE for site boundary"
         )
         
-        if uploaded:
+        if uploaded and land_source_changed(('dxf', uploaded.file_id)):
+            st.session_state.dxf_upload_result = None
             with st.spinner("⏳ Parsing DXF..."):
                 try:
-                    # Upload to backend API
-                    files = {"file": (uploaded.name, uploaded.getvalue(), "application/dxf")}
-                    response = requests.post(f"{API_URL}/api/upload-dxf", files=files)
+                    # Upload to backend API; a view of the upload buffer goes into
+                    # the multipart body without an intermediate bytes copy
+                    files = {"file": (uploaded.name, uploaded.getbuffer(), "application/dxf")}
+                    response = api_session().post(f"{API_URL}/api/upload-dxf", files=files)
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = orjson.loads(response.content)
                         st.session_state.land_plot = data['polygon']
-                        st.success(f"✅ {data['message']}")
-                        st.info(f"📊 Area: {data['area']:.2f} m²")
+                        st.session_state.dxf_upload_result = data
                     else:
                         st.error(f"Failed to parse DXF: {response.text}")
                         st.session_state.land_plot = None
+                        st.session_state.land_source = None  # Retry on the next rerun
                         
                 except Exception as e:
                     st.error(f"Error uploading DXF: {str(e)}")
                     st.session_state.land_plot = None
+                    st.session_state.land_source = None
+        
+        if uploaded and st.session_state.get('dxf_upload_result'):
+            data = st.session_state.dxf_upload_result
+            st.success(f"✅ {data['message']}")
+            st.info(f"📊 Area: {data['area']:.2f} m²")
         
     elif input_method == "GeoJSON Upload":
-        uploaded = st.file_uploader("GeoJSON file", type=['json', 'geojson'], key="geojson_upload")
-        if uploaded:
+        uploaded_files = st.file_uploader(
+            "GeoJSON file(s)",
+            type=['json', 'geojson'],
+            key="geojson_upload",
+            accept_multiple_files=True,
+            help="Several files are sent in one request and optimized together as one site"
+        )
+        if uploaded_files:
             try:
-                data = json.load(uploaded)
-                if data['type'] == 'FeatureCollection':
-                    st.session_state.land_plot = data['features'][0]['geometry']
-                else:
-                    st.session_state.land_plot = data
-                st.success(f"✅ Loaded {uploaded.name}")
+                if land_source_changed(('geojson', tuple(f.file_id for f in uploaded_files))):
+                    plots = [read_land_geometry(f) for f in uploaded_files]
+                    st.session_state.land_plot = plots[0]
+                    st.session_state.land_plot_batch = plots if len(plots) > 1 else []
+                st.success(f"✅ Loaded {', '.join(f.name for f in uploaded_files)}")
             except Exception as e:
                 st.error(f"Invalid file: {e}")
                 st.session_state.land_plot = None
+                st.session_state.land_plot_batch = []
+                st.session_state.land_source = None
                 
     else:  # Manual
         coords_input = st.text_area(
@@ -722,19 +1842,16 @@ with col_action:
             height=150
         )
         try:
-            coords = json.loads(coords_input)
-            st.session_state.land_plot = {
-                "type": "Polygon",
-                "coordinates": [coords],
-                "properties": {}
-            }
-        except:
-            st.error("Invalid JSON")
+            if land_source_changed(('manual', coords_input)):
+                st.session_state.land_plot = parse_manual_coords(coords_input)
+        except ValueError as e:  # Includes orjson.JSONDecodeError
+            st.session_state.land_source = None  # Reparse until the text is valid
+            st.error(f"Invalid coordinates: {e}")
     
     # Preview
     if st.session_state.land_plot:
         with st.expander("📋 Preview", expanded=False):
-            st.json(st.session_state.land_plot, expanded=False)
+            st.json(st.session_state.land_plot_batch or st.session_state.land_plot, expanded=False)
     
     st.markdown("---")
     
@@ -746,17 +1863,23 @@ with col_action:
     if status == 'ready':
         st.success("✅ Ready to optimize")
     elif status == 'running':
-        st.warning("⏳ Processing...")
+        elapsed = time.time() - st.session_state.started_at
+        st.warning(f"⏳ Running NSGA-II + OR-Tools... {elapsed:.0f}s")
+        # The backend finishes the run; cancelling stops polling and discards it
+        if st.button("✖ Cancel", use_container_width=True):
+            st.session_state.job_id = None
+            st.session_state.status = 'ready'
+            st.rerun()
     elif status == 'complete':
         st.success("✅ Complete!")
     else:
         st.error("❌ Error occurred")
+        if st.session_state.error:
+            st.error(st.session_state.error)
     
     # Run button
     if st.button("🚀 Run Optimization", type="primary", use_container_width=True, 
-                 disabled=st.session_state.land_plot is None):
-        
-        st.session_state.status = 'running'
+                 disabled=st.session_state.land_plot is None or status == 'running'):
         
         config = {
             "spacing_min": spacing_min,
@@ -773,45 +1896,29 @@ with col_action:
             "ortools_time_limit": ortools_time_limit
         }
         
-        with st.spinner("Running NSGA-II + OR-Tools..."):
-            try:
-                # Show progress information
-                progress_text = st.empty()
-                progress_text.info(f"🔄 Starting optimization with {population_size} population × {generations} generations...")
-                
-                response = requests.post(
-                    f"{API_URL}/api/optimize",
-                    json={
-                        "config": config,
-                        "land_plots": [st.session_state.land_plot]
-                    },
-                    timeout=600  # Increased to 10 minutes
-                )
-                
-                progress_text.empty()
-                
-                if response.status_code == 200:
-                    st.session_state.result = response.json()
-                    st.session_state.status = 'complete'
-                    st.rerun()
-                else:
-                    st.session_state.status = 'error'
-                    st.error(f"API Error: {response.text[:200]}")
-                    
-            except requests.exceptions.Timeout:
-                st.session_state.status = 'error'
-                st.error(f"⏱️ Optimization timed out after 10 minutes. Try reducing Population ({population_size}) or Generations ({generations}).")
-            except requests.exceptions.ConnectionError:
-                st.session_state.status = 'error'
-                st.error("Cannot connect to API. Is backend running on port 8000?")
-            except Exception as e:
-                st.session_state.status = 'error'
-                st.error(f"Error: {str(e)}")
+        # Submit the job; the script polls its status on each rerun below
+        try:
+            st.session_state.job_id = submit_optimization({
+                "config": config,
+                "land_plots": input_land_plots()
+            })
+            st.session_state.status = 'running'
+            st.session_state.error = None
+        except requests.exceptions.ConnectionError:
+            st.session_state.status = 'error'
+            st.session_state.error = "Cannot connect to API. Is backend running on port 8000?"
+        except Exception as e:
+            st.session_state.status = 'error'
+            st.session_state.error = f"Error: {str(e)}"
+        st.session_state.run_config = config
+        st.session_state.started_at = time.time()
+        st.rerun()
     
     # Reset button
     if st.session_state.result:
         if st.button("🔄 Reset", use_container_width=True):
             st.session_state.result = None
+            st.session_state.layout = []
             st.session_state.status = 'ready'
             st.rerun()
 
@@ -825,25 +1932,10 @@ with col_result:
         
         # Show input polygon preview
         if st.session_state.land_plot:
-            coords = st.session_state.land_plot['coordinates'][0]
-            xs = [c[0] for c in coords]
-            ys = [c[1] for c in coords]
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=xs, y=ys,
-                fill='toself',
-                fillcolor='rgba(100, 126, 234, 0.2)',
-                line=dict(color='#667eea', width=2),
-                name='Input Land'
-            ))
-            fig.update_layout(
-                height=400,
-                margin=dict(l=20, r=20, t=40, b=20),
-                title="Input Land Plot",
-                showlegend=False
+            land_plots = input_land_plots()
+            fig = cached_figure(
+                'preview', result_key({'land_plots': land_plots}), lambda: plot_input_preview(land_plots)
             )
-            fig.update_yaxes(scaleanchor="x", scaleratio=1)
             st.plotly_chart(fig, use_container_width=True)
     
     else:
@@ -872,701 +1964,23 @@ with col_result:
         # === Advanced Interactive Visualization (Plotly) ===
         st.markdown("### 🗺️ Master Plan Visualization")
         
-        def plot_master_plan_plotly(result_data):
-            """
-            CAD-Style Master Plan Visualization.
-            Professional engineering drawing with:
-            - Hatching patterns on lots (like AutoCAD)
-            - Tree symbols in parks
-            - Road centerlines and edges
-            - Building-style thick borders
-            - Engineering grid background
-            """
-            import random
-            from shapely.geometry import Point
-            
-            try:
-                features = result_data.get('final_layout', {}).get('features', [])
-                fig = go.Figure()
-                
-                # Collect bounds for auto-fit
-                all_x, all_y = [], []
-                
-                # --- HELPER FUNCTIONS ---
-                def get_poly_coords(geom):
-                    if geom.geom_type == 'Polygon':
-                        return [geom.exterior.xy]
-                    elif geom.geom_type == 'MultiPolygon':
-                        return [poly.exterior.xy for poly in geom.geoms]
-                    return []
-
-                def get_line_coords(geom):
-                    if geom.geom_type == 'LineString':
-                        return [geom.xy]
-                    elif geom.geom_type == 'MultiLineString':
-                        return [line.xy for line in geom.geoms]
-                    return []
-                
-                def generate_trees_in_polygon(polygon, count=8):
-                    """Generate tree positions within a polygon"""
-                    minx, miny, maxx, maxy = polygon.bounds
-                    trees = []
-                    attempts = 0
-                    while len(trees) < count and attempts < 100:
-                        px = random.uniform(minx, maxx)
-                        py = random.uniform(miny, maxy)
-                        if polygon.contains(Point(px, py)):
-                            trees.append((px, py))
-                        attempts += 1
-                    return trees
-                
-                def generate_hatch_lines(polygon, spacing=15, angle=45):
-                    """Generate hatching lines for a polygon"""
-                    import math
-                    minx, miny, maxx, maxy = polygon.bounds
-                    lines_x, lines_y = [], []
-                    
-                    # Extend bounds to ensure coverage
-                    diag = math.sqrt((maxx-minx)**2 + (maxy-miny)**2)
-                    cx, cy = (minx+maxx)/2, (miny+maxy)/2
-                    
-                    rad = math.radians(angle)
-                    cos_a, sin_a = math.cos(rad), math.sin(rad)
-                    
-                    # Generate parallel lines
-                    for offset in range(-int(diag/2), int(diag/2), spacing):
-                        # Line perpendicular to angle
-                        x1 = cx + offset * cos_a - diag * sin_a
-                        y1 = cy + offset * sin_a + diag * cos_a
-                        x2 = cx + offset * cos_a + diag * sin_a
-                        y2 = cy + offset * sin_a - diag * cos_a
-                        
-                        # Clip to polygon
-                        from shapely.geometry import LineString
-                        line = LineString([(x1, y1), (x2, y2)])
-                        clipped = polygon.intersection(line)
-                        
-                        if clipped.is_empty:
-                            continue
-                        if clipped.geom_type == 'LineString':
-                            coords = list(clipped.coords)
-                            if len(coords) >= 2:
-                                lines_x.extend([coords[0][0], coords[-1][0], None])
-                                lines_y.extend([coords[0][1], coords[-1][1], None])
-                        elif clipped.geom_type == 'MultiLineString':
-                            for seg in clipped.geoms:
-                                coords = list(seg.coords)
-                                if len(coords) >= 2:
-                                    lines_x.extend([coords[0][0], coords[-1][0], None])
-                                    lines_y.extend([coords[0][1], coords[-1][1], None])
-                    
-                    return lines_x, lines_y
-
-                # --- CAD COLOR PALETTE ---
-                CAD_COLORS = {
-                    'lot_fill': 'rgba(255, 248, 220, 0.6)',      # Cream/Beige
-                    'lot_hatch': '#cd853f',                       # Peru/Brown
-                    'lot_border': '#8b4513',                      # Saddle Brown
-                    'park_fill': 'rgba(144, 238, 144, 0.4)',     # Light Green
-                    'park_border': '#228b22',                     # Forest Green
-                    'tree': '#228b22',                            # Forest Green
-                    'tree_outline': '#006400',                    # Dark Green
-                    'xlnt_fill': 'rgba(0, 206, 209, 0.4)',       # Cyan
-                    'xlnt_border': '#008b8b',                     # Dark Cyan
-                    'service_fill': 'rgba(221, 160, 221, 0.5)',  # Plum
-                    'service_border': '#8b008b',                  # Dark Magenta
-                    'electric': '#0000cd',                        # Medium Blue
-                    'transformer': '#ff0000',                     # Red
-                    'drainage': '#00ced1',                        # Dark Turquoise
-                    'road_center': '#8b0000',                     # Dark Red
-                    'road_edge': '#2f4f4f',                       # Dark Slate Gray
-                }
-
-                # === LAYER 0: ROAD NETWORK (Background) ===
-                # Draw road areas as white/beige with edge lines
-                road_legend_shown = False
-                road_centerlines_x, road_centerlines_y = [], []
-                
-                for f in features:
-                    props = f['properties']
-                    if props.get('type') == 'road_network':
-                        geom = shape(f['geometry'])
-                        # Check if this is a reasonably sized road (not the huge bounding box)
-                        if geom.area < 100000:  # Only draw if < 100,000 m²
-                            coords_list = get_poly_coords(geom)
-                            for xs, ys in coords_list:
-                                # Draw road polygon
-                                fig.add_trace(go.Scatter(
-                                    x=list(xs), y=list(ys),
-                                    fill='toself',
-                                    fillcolor='rgba(245, 245, 220, 0.8)',  # Beige
-                                    line=dict(color=CAD_COLORS['road_edge'], width=2),
-                                    name='🛣️ Đường Giao Thông',
-                                    legendgroup='roads',
-                                    showlegend=not road_legend_shown,
-                                    hoverinfo='text',
-                                    text='Road Network'
-                                ))
-                                road_legend_shown = True
-                            
-                            # Generate centerline from polygon centroid
-                            if geom.geom_type == 'Polygon':
-                                # Get bounding box for centerline
-                                minx, miny, maxx, maxy = geom.bounds
-                                cx, cy = geom.centroid.x, geom.centroid.y
-                                
-                                # Determine if road is more horizontal or vertical
-                                if (maxx - minx) > (maxy - miny):
-                                    # Horizontal road
-                                    road_centerlines_x.extend([minx, maxx, None])
-                                    road_centerlines_y.extend([cy, cy, None])
-                                else:
-                                    # Vertical road
-                                    road_centerlines_x.extend([cx, cx, None])
-                                    road_centerlines_y.extend([miny, maxy, None])
-                
-                # Draw all road centerlines
-                if road_centerlines_x:
-                    fig.add_trace(go.Scatter(
-                        x=road_centerlines_x, y=road_centerlines_y,
-                        mode='lines',
-                        line=dict(color=CAD_COLORS['road_center'], width=2, dash='dash'),
-                        name='Road Centerline',
-                        legendgroup='roads',
-                        showlegend=False,
-                        hoverinfo='skip'
-                    ))
-
-                # === LAYER 1: LOTS WITH DOUBLE-LINE BORDERS (CAD STYLE) ===
-                lot_legend_shown = False
-                hatch_legend_shown = False
-                
-                for f in features:
-                    props = f['properties']
-                    ftype = props.get('type')
-                    
-                    if ftype == 'lot':
-                        geom = shape(f['geometry'])
-                        coords_list = get_poly_coords(geom)
-                        area = props.get('area', 0)
-                        lot_id = props.get('id', 'N/A')
-                        
-                        for xs, ys in coords_list:
-                            all_x.extend(list(xs))
-                            all_y.extend(list(ys))
-                            
-                            # OUTER BORDER (thick dark - like building wall)
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill=None,
-                                mode='lines',
-                                line=dict(color='#5d4037', width=5),  # Dark brown outer
-                                legendgroup='lots',
-                                showlegend=False,
-                                hoverinfo='skip'
-                            ))
-                            
-                            # FILL with inner border
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill='toself',
-                                fillcolor=CAD_COLORS['lot_fill'],
-                                line=dict(color=CAD_COLORS['lot_border'], width=2),
-                                name='🏭 Lô Đất',
-                                legendgroup='lots',
-                                showlegend=not lot_legend_shown,
-                                hovertemplate=f"<b>🏭 Lô {lot_id}</b><br>Diện tích: {area:.0f} m²<br><extra></extra>"
-                            ))
-                            lot_legend_shown = True
-                        
-                        # Add lot ID label in center
-                        cx, cy = geom.centroid.x, geom.centroid.y
-                        fig.add_annotation(
-                            x=cx, y=cy,
-                            text=f"<b>L{lot_id}</b>",
-                            font=dict(size=9, color='#5d4037', family='Arial'),
-                            showarrow=False,
-                            bgcolor='rgba(255,255,255,0.7)',
-                            borderpad=2
-                        )
-                        
-                        # Add hatching lines (increased spacing for less density)
-                        try:
-                            hatch_x, hatch_y = generate_hatch_lines(geom, spacing=30, angle=45)
-                            if hatch_x:
-                                fig.add_trace(go.Scatter(
-                                    x=hatch_x, y=hatch_y,
-                                    mode='lines',
-                                    line=dict(color=CAD_COLORS['lot_hatch'], width=0.8),
-                                    name='Hatching',
-                                    legendgroup='lots',
-                                    showlegend=False,
-                                    hoverinfo='skip'
-                                ))
-                        except:
-                            pass  # Skip hatching if it fails
-
-                # === LAYER 2: PARKS WITH TREES ===
-                park_legend_shown = False
-                all_star_trees_x, all_star_trees_y = [], []  # Star-shaped trees
-                all_circle_trees_x, all_circle_trees_y = [], []  # Circle trees
-                all_palm_x, all_palm_y = [], []  # Palm/shrub trees
-                
-                for f in features:
-                    props = f['properties']
-                    ftype = props.get('type')
-                    
-                    if ftype == 'park':
-                        geom = shape(f['geometry'])
-                        coords_list = get_poly_coords(geom)
-                        
-                        for xs, ys in coords_list:
-                            all_x.extend(list(xs))
-                            all_y.extend(list(ys))
-                            
-                            # OUTER BORDER for parks (dark green)
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill=None,
-                                mode='lines',
-                                line=dict(color='#1b5e20', width=4),  # Dark green outer
-                                legendgroup='parks',
-                                showlegend=False,
-                                hoverinfo='skip'
-                            ))
-                            
-                            # Draw park fill with inner border
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill='toself',
-                                fillcolor=CAD_COLORS['park_fill'],
-                                line=dict(color=CAD_COLORS['park_border'], width=2),
-                                name='🌳 Cây Xanh',
-                                legendgroup='parks',
-                                showlegend=not park_legend_shown,
-                                hoverinfo='text',
-                                text='🌳 Park / Green Space'
-                            ))
-                            park_legend_shown = True
-                        
-                        # Generate star-shaped trees (main trees)
-                        tree_count = max(5, int(geom.area / 300))
-                        trees = generate_trees_in_polygon(geom, min(tree_count, 25))
-                        for i, (tx, ty) in enumerate(trees):
-                            if i % 3 == 0:
-                                all_star_trees_x.append(tx)
-                                all_star_trees_y.append(ty)
-                            elif i % 3 == 1:
-                                all_circle_trees_x.append(tx)
-                                all_circle_trees_y.append(ty)
-                            else:
-                                all_palm_x.append(tx)
-                                all_palm_y.append(ty)
-                
-                # Also add trees along lot boundaries (like CAD drawing)
-                for f in features:
-                    props = f['properties']
-                    if props.get('type') == 'lot':
-                        geom = shape(f['geometry'])
-                        if geom.geom_type == 'Polygon':
-                            # Add trees at polygon vertices/corners
-                            coords = list(geom.exterior.coords)
-                            step = max(1, len(coords) // 4)  # ~4 trees per lot boundary
-                            for i in range(0, len(coords), step):
-                                px, py = coords[i]
-                                # Offset slightly into the lot
-                                cx, cy = geom.centroid.x, geom.centroid.y
-                                offset_x = (cx - px) * 0.05
-                                offset_y = (cy - py) * 0.05
-                                all_circle_trees_x.append(px + offset_x)
-                                all_circle_trees_y.append(py + offset_y)
-                
-                # Draw star-shaped trees (CAD style - like asterisks)
-                if all_star_trees_x:
-                    fig.add_trace(go.Scatter(
-                        x=all_star_trees_x, y=all_star_trees_y,
-                        mode='markers',
-                        marker=dict(
-                            symbol='asterisk',
-                            size=14,
-                            color='#2e8b57',  # Sea green
-                            line=dict(width=2, color='#006400'),
-                        ),
-                        name='🌲 Cây Lớn',
-                        legendgroup='trees',
-                        hoverinfo='text',
-                        text='🌲 Large Tree'
-                    ))
-                
-                # Draw circle trees
-                if all_circle_trees_x:
-                    fig.add_trace(go.Scatter(
-                        x=all_circle_trees_x, y=all_circle_trees_y,
-                        mode='markers',
-                        marker=dict(
-                            symbol='circle',
-                            size=10,
-                            color='#32cd32',  # Lime green
-                            line=dict(width=1.5, color='#228b22'),
-                            opacity=0.85
-                        ),
-                        name='🌳 Cây Trung',
-                        legendgroup='trees',
-                        showlegend=False,
-                        hoverinfo='text',
-                        text='🌳 Medium Tree'
-                    ))
-                
-                # Draw palm/shrub markers
-                if all_palm_x:
-                    fig.add_trace(go.Scatter(
-                        x=all_palm_x, y=all_palm_y,
-                        mode='markers',
-                        marker=dict(
-                            symbol='hexagram',
-                            size=8,
-                            color='#90ee90',  # Light green
-                            line=dict(width=1, color='#228b22'),
-                            opacity=0.8
-                        ),
-                        name='🌴 Cây Nhỏ',
-                        legendgroup='trees',
-                        showlegend=False,
-                        hoverinfo='text',
-                        text='🌴 Small Plant'
-                    ))
-
-                # === LAYER 3: SERVICE & TECHNICAL AREAS ===
-                legend_xlnt = False
-                legend_service = False
-                
-                for f in features:
-                    props = f['properties']
-                    ftype = props.get('type')
-                    
-                    if ftype == 'xlnt':
-                        geom = shape(f['geometry'])
-                        coords_list = get_poly_coords(geom)
-                        for xs, ys in coords_list:
-                            all_x.extend(list(xs))
-                            all_y.extend(list(ys))
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill='toself',
-                                fillcolor=CAD_COLORS['xlnt_fill'],
-                                line=dict(color=CAD_COLORS['xlnt_border'], width=2.5),
-                                name='💧 XLNT',
-                                legendgroup='xlnt',
-                                showlegend=not legend_xlnt,
-                                hoverinfo='text',
-                                text='💧 Xử Lý Nước Thải'
-                            ))
-                            legend_xlnt = True
-                    
-                    elif ftype == 'service':
-                        geom = shape(f['geometry'])
-                        coords_list = get_poly_coords(geom)
-                        for xs, ys in coords_list:
-                            all_x.extend(list(xs))
-                            all_y.extend(list(ys))
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                fill='toself',
-                                fillcolor=CAD_COLORS['service_fill'],
-                                line=dict(color=CAD_COLORS['service_border'], width=2.5),
-                                name='🏢 Điều Hành',
-                                legendgroup='service',
-                                showlegend=not legend_service,
-                                hoverinfo='text',
-                                text='🏢 Service / Admin'
-                            ))
-                            legend_service = True
-
-                # === LAYER 4: ELECTRIC NETWORK ===
-                electric_legend_shown = False
-                for f in features:
-                    if f['properties'].get('type') == 'connection':
-                        geom = shape(f['geometry'])
-                        coords_list = get_line_coords(geom)
-                        for xs, ys in coords_list:
-                            all_x.extend(list(xs))
-                            all_y.extend(list(ys))
-                            
-                            # Draw as dashed line
-                            fig.add_trace(go.Scatter(
-                                x=list(xs), y=list(ys),
-                                mode='lines',
-                                line=dict(color=CAD_COLORS['electric'], width=2, dash='dashdot'),
-                                name='⚡ Điện Ngầm',
-                                legendgroup='electric',
-                                showlegend=not electric_legend_shown,
-                                hoverinfo='text',
-                                text='⚡ Underground Cable'
-                            ))
-                            electric_legend_shown = True
-
-                # === LAYER 5: TRANSFORMERS ===
-                t_x, t_y = [], []
-                for f in features:
-                    if f['properties'].get('type') == 'transformer':
-                        pt = shape(f['geometry'])
-                        t_x.append(pt.x)
-                        t_y.append(pt.y)
-                        all_x.append(pt.x)
-                        all_y.append(pt.y)
-                
-                if t_x:
-                    fig.add_trace(go.Scatter(
-                        x=t_x, y=t_y,
-                        mode='markers+text',
-                        marker=dict(
-                            symbol='square',
-                            size=14,
-                            color=CAD_COLORS['transformer'],
-                            line=dict(width=2, color='white')
-                        ),
-                        text=['T'] * len(t_x),
-                        textposition='middle center',
-                        textfont=dict(size=8, color='white', family='Arial Black'),
-                        name='🔴 Trạm Biến Áp',
-                        legendgroup='transformer',
-                        hoverinfo='text',
-                        hovertext='🔴 Transformer Station'
-                    ))
-
-                # === LAYER 6: DRAINAGE ===
-                drain_features = [f for f in features if f['properties'].get('type') == 'drainage']
-                if len(drain_features) > 25:
-                    drain_features = drain_features[::2]
-                    
-                for f in drain_features:
-                    geom = shape(f['geometry'])
-                    if geom.geom_type == 'LineString':
-                        coords = list(geom.coords)
-                        if len(coords) >= 2:
-                            fig.add_annotation(
-                                x=coords[-1][0], y=coords[-1][1],
-                                ax=coords[0][0], ay=coords[0][1],
-                                xref='x', yref='y', axref='x', ayref='y',
-                                showarrow=True,
-                                arrowhead=3,
-                                arrowsize=1.5,
-                                arrowwidth=2,
-                                arrowcolor=CAD_COLORS['drainage']
-                            )
-
-                # Dummy trace for Drainage Legend
-                fig.add_trace(go.Scatter(
-                    x=[None], y=[None],
-                    mode='lines+markers',
-                    marker=dict(symbol='arrow', color=CAD_COLORS['drainage'], size=8),
-                    line=dict(color=CAD_COLORS['drainage'], width=2),
-                    name='💧 Thoát Nước',
-                    legendgroup='drainage'
-                ))
-
-                # === AUTO-FIT BOUNDS ===
-                if all_x and all_y:
-                    x_min, x_max = min(all_x), max(all_x)
-                    y_min, y_max = min(all_y), max(all_y)
-                    x_pad = (x_max - x_min) * 0.08
-                    y_pad = (y_max - y_min) * 0.08
-                    x_range = [x_min - x_pad, x_max + x_pad]
-                    y_range = [y_min - y_pad, y_max + y_pad]
-                else:
-                    x_range = None
-                    y_range = None
-
-                # === CAD-STYLE LAYOUT ===
-                fig.update_layout(
-                    title=dict(
-                        text="<b>📐 QUY HOẠCH CHI TIẾT 1/500</b>",
-                        y=0.98,
-                        x=0.5,
-                        xanchor='center',
-                        yanchor='top',
-                        font=dict(size=18, color='#1a1a1a', family='Arial Black')
-                    ),
-                    height=1000,  # Taller for more space
-                    xaxis=dict(
-                        showgrid=True,
-                        gridcolor='rgba(200, 200, 200, 0.3)',
-                        gridwidth=1,
-                        zeroline=False,
-                        scaleanchor="y",
-                        scaleratio=1,
-                        title=dict(text="X (meters)", font=dict(size=11, color='#333')),
-                        range=x_range,
-                        showspikes=True,
-                        spikecolor='#666',
-                        spikethickness=1,
-                        tickfont=dict(size=10),
-                        side='bottom'
-                    ),
-                    yaxis=dict(
-                        showgrid=True,
-                        gridcolor='rgba(200, 200, 200, 0.3)',
-                        gridwidth=1,
-                        zeroline=False,
-                        title=dict(text="Y (meters)", font=dict(size=11, color='#333')),
-                        range=y_range,
-                        showspikes=True,
-                        spikecolor='#666',
-                        spikethickness=1,
-                        tickfont=dict(size=10)
-                    ),
-                    plot_bgcolor='rgba(255, 255, 252, 1)',  # Warm white like paper
-                    paper_bgcolor='white',
-                    hovermode='closest',
-                    showlegend=True,
-                    legend=dict(
-                        orientation="h",
-                        yanchor="top",
-                        y=-0.08,  # Below the chart
-                        xanchor="center",
-                        x=0.5,
-                        bgcolor='rgba(255,255,255,0.95)',
-                        bordercolor='rgba(0,0,0,0.1)',
-                        borderwidth=1,
-                        font=dict(size=9, family='Arial'),
-                        itemsizing='constant',
-                        tracegroupgap=5
-                    ),
-                    margin=dict(l=60, r=60, t=60, b=100)  # More space at bottom for legend
-                )
-                
-                # === CAD-STYLE ANNOTATIONS ===
-                # North Arrow (top-right corner)
-                fig.add_annotation(
-                    x=0.97, y=0.97,
-                    xref='paper', yref='paper',
-                    text='<b>⬆ N</b>',
-                    font=dict(size=16, color='#333', family='Arial Black'),
-                    showarrow=False,
-                    bgcolor='rgba(255,255,255,0.9)',
-                    bordercolor='#333',
-                    borderwidth=1,
-                    borderpad=4
-                )
-                
-                # Scale Bar (calculate based on data range)
-                if x_range and y_range:
-                    plot_width = x_range[1] - x_range[0]
-                    # Determine appropriate scale bar length
-                    if plot_width > 1000:
-                        scale_len = 200
-                        scale_text = '200m'
-                    elif plot_width > 500:
-                        scale_len = 100
-                        scale_text = '100m'
-                    else:
-                        scale_len = 50
-                        scale_text = '50m'
-                    
-                    # Scale bar position (bottom-left)
-                    sb_x = x_range[0] + (x_range[1] - x_range[0]) * 0.05
-                    sb_y = y_range[0] + (y_range[1] - y_range[0]) * 0.03
-                    
-                    # Draw scale bar line
-                    fig.add_trace(go.Scatter(
-                        x=[sb_x, sb_x + scale_len],
-                        y=[sb_y, sb_y],
-                        mode='lines',
-                        line=dict(color='black', width=3),
-                        showlegend=False,
-                        hoverinfo='skip'
-                    ))
-                    
-                    # Scale bar end caps
-                    fig.add_trace(go.Scatter(
-                        x=[sb_x, sb_x],
-                        y=[sb_y - 5, sb_y + 5],
-                        mode='lines',
-                        line=dict(color='black', width=2),
-                        showlegend=False,
-                        hoverinfo='skip'
-                    ))
-                    fig.add_trace(go.Scatter(
-                        x=[sb_x + scale_len, sb_x + scale_len],
-                        y=[sb_y - 5, sb_y + 5],
-                        mode='lines',
-                        line=dict(color='black', width=2),
-                        showlegend=False,
-                        hoverinfo='skip'
-                    ))
-                    
-                    # Scale bar label
-                    fig.add_annotation(
-                        x=sb_x + scale_len / 2, y=sb_y + 15,
-                        text=f'<b>{scale_text}</b>',
-                        font=dict(size=10, color='#333'),
-                        showarrow=False,
-                        bgcolor='rgba(255,255,255,0.8)'
-                    )
-
-                return fig
-
-            except Exception as e:
-                st.error(f"Plotting error: {e}")
-                return None
-
-        # Display Plot
-        fig = plot_master_plan_plotly(result)
-        if fig:
-            st.plotly_chart(fig, use_container_width=True)
+        # Display Plot (deck.gl for layouts too large for per-feature Plotly traces)
+        # Figures are rebuilt only when the result changes, not on every rerun
+        plan_key = result_key(result)
+        master_features = st.session_state.layout
+        if len(master_features) > DECK_MIN_FEATURES:
+            st.caption(f"{len(master_features)} features: rendered with deck.gl (WebGL)")
+            deck = cached_figure('plan', plan_key, lambda: layout_deck(master_features))
+            st.pydeck_chart(deck, use_container_width=True)
+        else:
+            fig = cached_figure('plan', plan_key, lambda: plot_master_plan_plotly(master_features))
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
         
         # Visualization (Plotly)
         stages = result.get('stages', [])
         if len(stages) >= 2:
-            fig = make_subplots(
-                rows=1, cols=2,
-                subplot_titles=('Stage 1: Grid Optimization', 'Stage 2: Subdivision'),
-                horizontal_spacing=0.05
-            )
-            
-            # Stage 1: Grid blocks
-            for feature in stages[0]['geometry']['features']:
-                coords = feature['geometry']['coordinates'][0]
-                xs = [c[0] for c in coords]
-                ys = [c[1] for c in coords]
-                
-                fig.add_trace(go.Scatter(
-                    x=xs, y=ys,
-                    fill='toself',
-                    fillcolor='rgba(100, 126, 234, 0.5)',
-                    line=dict(color='#667eea', width=1),
-                    showlegend=False,
-                    hoverinfo='skip'
-                ), row=1, col=1)
-            
-            # Stage 2: Lots and parks
-            for feature in stages[1]['geometry']['features']:
-                coords = feature['geometry']['coordinates'][0]
-                xs = [c[0] for c in coords]
-                ys = [c[1] for c in coords]
-                
-                ftype = feature['properties'].get('type', 'lot')
-                color = 'rgba(255, 152, 0, 0.7)' if ftype == 'lot' else 'rgba(76, 175, 80, 0.7)'
-                line_color = '#ff9800' if ftype == 'lot' else '#4caf50'
-                
-                fig.add_trace(go.Scatter(
-                    x=xs, y=ys,
-                    fill='toself',
-                    fillcolor=color,
-                    line=dict(color=line_color, width=1),
-                    showlegend=False,
-                    hoverinfo='text',
-                    text=ftype.title()
-                ), row=1, col=2)
-            
-            fig.update_layout(
-                height=450,
-                margin=dict(l=20, r=20, t=40, b=20),
-                showlegend=False
-            )
-            fig.update_xaxes(scaleanchor="y", scaleratio=1)
-            fig.update_yaxes(scaleanchor="x", scaleratio=1)
-            
+            fig = cached_figure('stages', plan_key, lambda: plot_stage_comparison(stages))
             st.plotly_chart(fig, use_container_width=True)
             
             # Legend
@@ -1597,18 +2011,20 @@ with col_result:
             if result.get('final_layout'):
                 st.download_button(
                     "📄 GeoJSON",
-                    data=json.dumps(result['final_layout'], indent=2),
-                    file_name="layout.geojson",
-                    mime="application/json",
+                    data=cached_figure('geojson_download', plan_key, lambda: gzip_json(
+                        {"type": "FeatureCollection", "features": st.session_state.layout}
+                    )),
+                    file_name="layout.geojson.gz",
+                    mime="application/gzip",
                     use_container_width=True
                 )
         
         with d2:
             st.download_button(
                 "📊 Full Report",
-                data=json.dumps(result, indent=2),
-                file_name="report.json",
-                mime="application/json",
+                data=cached_figure('report_download', plan_key, lambda: gzip_json(result)),
+                file_name="report.json.gz",
+                mime="application/gzip",
                 use_container_width=True
             )
         
@@ -1617,21 +2033,40 @@ with col_result:
             if st.button("📐 Export DXF", use_container_width=True, key="export_dxf"):
                 with st.spinner("Generating DXF..."):
                     try:
-                        response = requests.post(
-                            f"{API_URL}/api/export-dxf",
-                            json={"result": result}
-                        )
+                        # The server keeps recent results; fall back to
+                        # uploading the full result if it was evicted
+                        response = None
+                        if result.get('result_id'):
+                            response = post_json(
+                                "/api/export-dxf",
+                                {"result_id": result['result_id']},
+                                stream=True
+                            )
+                        if response is None or response.status_code == 404:
+                            if response is not None:
+                                response.close()
+                            response = post_json(
+                                "/api/export-dxf",
+                                {"result": result},
+                                stream=True
+                            )
                         
                         if response.status_code == 200:
                             st.download_button(
                                 "⬇️ Download DXF",
-                                data=response.content,
+                                data=read_download(response),
                                 file_name="land_redistribution.dxf",
                                 mime="application/dxf",
                                 use_container_width=True,
                                 key="download_dxf"
                             )
                         else:
+                            response.close()
                             st.error("Failed to generate DXF")
                     except Exception as e:
                         st.error(f"DXF export error: {str(e)}")
+
+# Poll the submitted optimization until it finishes (collected at the top)
+if st.session_state.job_id is not None:
+    time.sleep(1)
+    st.rerun()